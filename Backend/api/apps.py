@@ -4,3 +4,30 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from django.core.handlers.asgi import ASGIHandler
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+        from rest_framework.authtoken.models import Token
+
+        from api.authentication import evict_token, evict_user
+        from api.metrics import install_sql_timer
+        from api.purge import resume_worker
+
+        post_save.connect(evict_token, sender=Token, dispatch_uid="api.evict_token_on_save")
+        post_delete.connect(evict_token, sender=Token, dispatch_uid="api.evict_token_on_delete")
+        post_save.connect(evict_user, sender=User, dispatch_uid="api.evict_user_on_save")
+        post_delete.connect(evict_user, sender=User, dispatch_uid="api.evict_user_on_delete")
+        connection_created.connect(install_sql_timer, dispatch_uid="api.install_sql_timer")
+        if getattr(settings, "PURGE_WORKER_IN_PROCESS", False):
+            # Only the real handlers, so management commands and the test
+            # client never start the worker.
+            for handler in (WSGIHandler, ASGIHandler):
+                request_started.connect(
+                    resume_worker, sender=handler, dispatch_uid=f"api.resume_purge_worker.{handler.__name__}"
+                )
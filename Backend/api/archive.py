@@ -0,0 +1,105 @@
+import zipfile
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from api.markdown import EXPORT_CHUNK_SIZE, export_filename, render_checklist
+from api.models import Task
+
+# A ZIP of many projects' checklists, written while it is being sent. The
+# archive goes to a write-only sink instead of a file, so zipfile streams
+# each entry with a data descriptor and nothing is kept once it has been
+# yielded. The tasks of every project come from two queries, pending and
+# completed, each walked in (project, rank) order alongside the projects.
+
+
+class _Sink:
+    """Write-only file for zipfile; ``drain()`` yields what was written since the last call."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        if chunks:
+            yield b"".join(chunks)
+
+
+class _ProjectRows:
+    """Hands out ``(report_id, description)`` rows, ordered by project, one project at a time."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.head = next(rows, None)
+
+    def take(self, project_id):
+        while self.head is not None and self.head[0] < project_id:
+            self.head = next(self.rows, None)
+        while self.head is not None and self.head[0] == project_id:
+            yield self.head[1]
+            self.head = next(self.rows, None)
+
+
+def _task_rows(projects, status, chunk_size):
+    tasks = Task.objects.filter(report__in=projects.values("id"), isDeleted=False, status=status)
+    rows = tasks.order_by("report_id", "rank", "id").values_list("report_id", "description")
+    return _ProjectRows(rows.iterator(chunk_size=chunk_size))
+
+
+def archive_name(project):
+    # Ids keep projects with the same title apart; trashed projects get a folder.
+    name = f"{project.id}-{export_filename(project)}"
+    return f"trash/{name}" if project.isDeleted else name
+
+
+def projects_archive(projects, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a ZIP of ``projects``, one Markdown checklist per project, as it is compressed.
+
+    Three queries whatever the number of projects; memory use depends on
+    neither the number of projects nor their size.
+    """
+    projects = projects.order_by("id")
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w") as archive:
+        pending = completed = None
+        for project in projects.iterator(chunk_size=chunk_size):
+            if pending is None:
+                pending = _task_rows(projects, "not_done", chunk_size)
+                completed = _task_rows(projects, "done", chunk_size)
+            modified = timezone.localtime(project.last_updated_on or project.created_date)
+            entry = zipfile.ZipInfo(archive_name(project), date_time=modified.timetuple()[:6])
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(entry, "w") as f:
+                for text in render_checklist(project, pending.take(project.id), completed.take(project.id), chunk_size):
+                    f.write(text.encode())
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+async def aprojects_archive(projects, chunk_size=EXPORT_CHUNK_SIZE):
+    """``projects_archive`` as an async iterator, for responses served under ASGI.
+
+    Django reads a sync iterator to the end before sending any of it under
+    ASGI; here each chunk is compressed in the thread that runs sync code
+    and sent as soon as it is ready.
+    """
+    chunks = projects_archive(projects, chunk_size)
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
@@ -0,0 +1,12 @@
+from django.urls import path
+from api import async_views
+
+urlpatterns = [
+    path('projects/', async_views.project_list, name='async-project-list'),
+    path('projects/<int:project_id>/', async_views.project_detail, name='async_project_detail'),
+    path('projects/<int:project_id>/add_task/', async_views.add_task, name='async_add_task'),
+    path('tasks/<int:task_id>/delete/', async_views.delete_task, name='async-delete-task'),
+    path('tasks/<int:task_id>/restore/', async_views.restore_task, name='async-restore-task'),
+    path('tasks/<int:task_id>/update_status/', async_views.update_task_status, name='async_update_task_status'),
+    path('tasks/<int:task_id>/update_description/', async_views.update_task_description, name='async_update_task_description'),
+]
@@ -0,0 +1,236 @@
+import json
+from functools import wraps
+
+from django.db.models import OuterRef
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from api.authentication import aauthenticate
+from api.cache import (
+    get_project_detail, get_project_list, invalidate_project, invalidate_project_list, set_project_detail,
+    set_project_list,
+)
+from api.conditional import aproject_list_validators, not_modified, project_validators, set_validators
+from api.events import publish, task_payload
+from api.models import Project, Task
+from api.pagination import InvalidCursor, akeyset_page, get_page_size, is_paginated
+from api.views import TASK_FIELDS, TOGGLE_STATUS
+
+# Async counterparts of the project and task views in api/views.py, built on
+# the async ORM. They only yield the worker while waiting on the database when
+# served through mark_it_down/asgi.py; under WSGI Django runs them in a loop
+# per request.
+
+
+def token_view(*methods):
+    def decorator(view):
+        @csrf_exempt
+        @require_http_methods(methods)
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            user = await aauthenticate(request)
+            if user is None:
+                return JsonResponse({"error": "Authentication required"}, status=401)
+            request.user = user
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _json_body(request):
+    """The request body as a dict, or ``None`` if it is not a JSON object."""
+    try:
+        body = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def _invalid_body():
+    return JsonResponse({"error": "Request body must be a JSON object"}, status=400)
+
+
+def _cached_response(request, entry):
+    data, etag, last_modified = entry
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = set_validators(JsonResponse(data, status=200, safe=False), etag, last_modified)
+    return response
+
+
+@token_view("GET")
+async def project_list(request):
+    cached, cache_key = get_project_list(request)
+    if cached is not None:
+        return _cached_response(request, cached)
+
+    projects = Project.objects.filter(created_by=request.user)
+
+    etag, last_modified = await aproject_list_validators(request, projects)
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    projects = projects.values(
+        "id", "title", "created_date", "isDeleted", "task_count", "done_count", "deleted_count"
+    )
+    if is_paginated(request):
+        try:
+            project_list, next_cursor = await akeyset_page(projects, request.GET.get("cursor"), get_page_size(request))
+        except InvalidCursor as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        project_list = {"results": project_list, "next_cursor": next_cursor}
+    else:
+        project_list = [project async for project in projects]
+
+    set_project_list(cache_key, (project_list, etag, last_modified))
+    return set_validators(JsonResponse(project_list, status=200, safe=False), etag, last_modified)
+
+
+@token_view("GET")
+async def project_detail(request, project_id):
+    cached, cache_key = get_project_detail(request, project_id)
+    if cached is not None:
+        return _cached_response(request, cached)
+
+    project = await Project.objects.filter(id=project_id, created_by=request.user).afirst()
+    if project is None:
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    etag, last_modified = project_validators(request, project)
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    response_data = {"id": project.id, "title": project.title, "created_date": project.created_date}
+    tasks = Task.objects.filter(report=project)
+    if is_paginated(request):
+        tasks = tasks.values(*TASK_FIELDS)
+        try:
+            page_size = get_page_size(request)
+            response_data["tasks"], response_data["next_cursor"] = await akeyset_page(
+                tasks.filter(isDeleted=False), request.GET.get("cursor"), page_size, key="rank"
+            )
+            response_data["deleted_task"], response_data["deleted_next_cursor"] = await akeyset_page(
+                tasks.filter(isDeleted=True), request.GET.get("deleted_cursor"), page_size, key="rank"
+            )
+        except InvalidCursor as e:
+            return JsonResponse({"error": str(e)}, status=400)
+    else:
+        response_data["tasks"] = task_data = []
+        response_data["deleted_task"] = deleted_task_data = []
+        async for *task, is_deleted in tasks.order_by("rank", "id").values_list(*TASK_FIELDS, "isDeleted"):
+            if is_deleted:
+                deleted_task_data.append(dict(zip(TASK_FIELDS, task)))
+            else:
+                task_data.append(dict(zip(TASK_FIELDS, task)))
+
+    set_project_detail(cache_key, (response_data, etag, last_modified))
+    return set_validators(JsonResponse(response_data, status=200), etag, last_modified)
+
+
+@token_view("POST")
+async def add_task(request, project_id):
+    project = await Project.objects.filter(id=project_id, created_by=request.user).afirst()
+    if project is None:
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    body = _json_body(request)
+    if body is None:
+        return _invalid_body()
+    task_description = body.get("description")
+    if not task_description:
+        return JsonResponse({"error": "Task description is required"}, status=400)
+
+    now = timezone.now()
+    task = await Task.objects.acreate(
+        report=project, description=task_description, status="not_done", created_date=now, last_updated_on=now,
+        version=Project.next_version(project.id),
+    )
+    await Project.abump_version(project.id, {"task_count": 1})
+    invalidate_project_list(request.user.id)
+    invalidate_project(project.id)
+    task_data = {field: getattr(task, field) for field in TASK_FIELDS}
+    publish(project.id, "task.created", task=task_payload(task_data))
+
+    return JsonResponse(task_data, status=201)
+
+
+async def _update_owned_task(user, task_id, event, **changes):
+    """Async version of ``api.views._update_owned_task``.
+
+    The async ORM has no transactions, so the task UPDATE and the version bump
+    commit separately; the UPDATE on its own is still a single atomic statement.
+    Another write can land between the UPDATE and the read-back, so the
+    counters are recounted instead of adjusted by ``task_count_deltas``.
+    """
+    tasks = Task.objects.filter(id=task_id, report__created_by=user)
+    if "isDeleted" in changes:
+        tasks = tasks.exclude(isDeleted=changes["isDeleted"])
+    updated = await tasks.aupdate(version=Project.next_version(OuterRef("report_id")), **changes)
+    task = await Task.objects.filter(id=task_id).values("report_id", "isDeleted", *TASK_FIELDS).afirst()
+    if updated:
+        await Project.abump_version(task["report_id"])
+        invalidate_project_list(user.id)
+        invalidate_project(task["report_id"])
+        publish(task["report_id"], event, task=task_payload(task))
+        return True, task
+    return task is not None and await Project.objects.filter(id=task["report_id"], created_by=user).aexists(), task
+
+
+def _mutation_error(updated, task, message):
+    if task is None:
+        return JsonResponse({"detail": "Task not found."}, status=404)
+    if not updated:
+        return JsonResponse({"detail": message}, status=403)
+    return None
+
+
+@token_view("PATCH")
+async def update_task_status(request, task_id):
+    updated, task = await _update_owned_task(
+        request.user, task_id, "task.updated", status=TOGGLE_STATUS, last_updated_on=timezone.now()
+    )
+    error = _mutation_error(updated, task, "Permission denied")
+    if error:
+        return error
+    return JsonResponse(task_payload(task), status=200)
+
+
+@token_view("PATCH")
+async def update_task_description(request, task_id):
+    body = _json_body(request)
+    if body is None:
+        return _invalid_body()
+    changes = {"last_updated_on": timezone.now()}
+    new_description = body.get("description")
+    if new_description:
+        changes["description"] = new_description
+
+    updated, task = await _update_owned_task(request.user, task_id, "task.updated", **changes)
+    error = _mutation_error(updated, task, "You do not have permission to edit this task.")
+    if error:
+        return error
+    return JsonResponse(task_payload(task), status=200)
+
+
+@token_view("DELETE")
+async def delete_task(request, task_id):
+    updated, task = await _update_owned_task(
+        request.user, task_id, "task.deleted", isDeleted=True, last_updated_on=timezone.now()
+    )
+    return _mutation_error(updated, task, "You do not have permission to delete this task.") or JsonResponse(
+        {"detail": "Task deleted successfully."}, status=204
+    )
+
+
+@token_view("DELETE")
+async def restore_task(request, task_id):
+    updated, task = await _update_owned_task(
+        request.user, task_id, "task.restored", isDeleted=False, last_updated_on=timezone.now()
+    )
+    return _mutation_error(updated, task, "You do not have permission to delete this task.") or JsonResponse(
+        {"detail": "Task deleted successfully."}, status=204
+    )
@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULT_TOKEN_CACHE_TTL = 60
+DEFAULT_TOKEN_CACHE_MAX_SIZE = 10000
+
+
+class TokenCache:
+    """Bounded LRU of resolved ``(user, token)`` pairs with a per-entry TTL.
+
+    Each entry also keeps the revocation generation it was stored under.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, "TOKEN_CACHE_TTL", DEFAULT_TOKEN_CACHE_TTL)
+
+    @property
+    def max_size(self):
+        return getattr(settings, "TOKEN_CACHE_MAX_SIZE", DEFAULT_TOKEN_CACHE_MAX_SIZE)
+
+    def get(self, key):
+        """Return ``(credentials, generation)``, or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, credentials, generation = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return credentials, generation
+
+    def set(self, key, credentials, generation=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, credentials, generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_user(self, user_id):
+        with self._lock:
+            for key in [key for key, (_, (user, _), _) in self._entries.items() if user.pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+# Revocations reach other processes through a per-token generation kept in
+# the TOKEN_REVOCATION_CACHE cache: the signal handlers below bump it, and a
+# cached token is only used while its generation is the one it was stored
+# under. The generation is read before the token is looked up, so a
+# revocation that lands during the lookup is never cached as current. That
+# costs one cache read per request instead of the Token + User join.
+
+def _revocations():
+    alias = getattr(settings, "TOKEN_REVOCATION_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _generation_key(token_key):
+    return f"auth:gen:{token_key}"
+
+
+def _token_generation(token_key):
+    cache = _revocations()
+    if cache is None:
+        return None
+    key = _generation_key(token_key)
+    generation = cache.get(key)
+    if generation is None:
+        # As in api.cache, a lost generation restarts at the current time.
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _cached_credentials(key, generation):
+    entry = token_cache.get(key)
+    if entry is None:
+        return None
+    credentials, cached_generation = entry
+    if cached_generation != generation:
+        token_cache.discard(key)
+        return None
+    return credentials
+
+
+def _revoke(token_key):
+    cache = _revocations()
+    if cache is None:
+        return
+    key = _generation_key(token_key)
+
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+    bump()
+    # Until the change commits, a request can still read the old rows and
+    # cache them under the new generation; bump again once it is visible.
+    if connection.in_atomic_block:
+        transaction.on_commit(bump)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in ``TokenAuthentication`` that skips the Token + User join on a cache hit.
+
+    Deleting or regenerating a ``Token`` and saving or deleting its ``User``
+    revoke the affected entries through the signal handlers below: at once
+    in this process, and in others on their next request once the change
+    has committed, provided TOKEN_REVOCATION_CACHE is shared between them.
+    Otherwise other processes keep using an entry until its TTL runs out.
+    """
+
+    def authenticate_credentials(self, key):
+        generation = _token_generation(key)
+        credentials = _cached_credentials(key, generation)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            token_cache.set(key, credentials, generation)
+        return credentials
+
+
+def request_token(request, allow_query=False):
+    """Return the key from an ``Authorization: Token <key>`` header, or ``?token=`` if allowed."""
+    header = request.headers.get("Authorization", "").split()
+    if len(header) == 2 and header[0] == "Token":
+        return header[1]
+    if allow_query:
+        return request.GET.get("token")
+    return None
+
+
+async def aauthenticate(request, allow_query=False):
+    """Resolve the request's token for plain async views; returns the user or ``None``."""
+    key = request_token(request, allow_query)
+    if not key:
+        return None
+    generation = _token_generation(key)
+    credentials = _cached_credentials(key, generation)
+    if credentials is None:
+        token = await Token.objects.select_related("user").filter(key=key).afirst()
+        if token is None or not token.user.is_active:
+            return None
+        credentials = (token.user, token)
+        token_cache.set(key, credentials, generation)
+    return credentials[0]
+
+
+def evict_token(sender, instance, **kwargs):
+    token_cache.discard(instance.key)
+    _revoke(instance.key)
+
+
+def evict_user(sender, instance, created=False, **kwargs):
+    token_cache.discard_user(instance.pk)
+    # A new user has no token yet, and deleting a user deletes its token,
+    # which evict_token has already revoked.
+    if created or kwargs["signal"] is post_delete:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list("key", flat=True):
+        _revoke(key)
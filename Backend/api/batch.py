@@ -0,0 +1,143 @@
+import io
+import json
+import re
+
+from django.db import transaction
+from django.urls import Resolver404, resolve
+
+# Runs a list of sub-requests against the routes in api/urls.py in one
+# request: the caller is authenticated once, every sub-request is dispatched
+# straight to its view inside a single transaction, and the first failure
+# rolls all of them back. Strings may refer to earlier results with
+# ``$<index>.<field>[.<field>...]``, e.g. ``/api/tasks/$0.id/update_status/``.
+
+BATCH_MAX_REQUESTS = 50
+BATCH_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+# Streaming responses, sign-in and nested batches make no sense inside a batch.
+BATCH_EXCLUDED_ROUTES = {"batch", "project_events", "project_export", "signup", "signin"}
+
+REFERENCE = re.compile(r"\$(\d+)((?:\.\w+)+)")
+
+
+class BatchError(Exception):
+    """A sub-request that cannot be dispatched; ``index`` is its position in the batch."""
+
+    def __init__(self, index, message):
+        super().__init__(message)
+        self.index = index
+
+
+def validate(items):
+    if not isinstance(items, list) or not 0 < len(items) <= BATCH_MAX_REQUESTS:
+        raise BatchError(None, f"requests must be a list of 1 to {BATCH_MAX_REQUESTS} sub-requests")
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise BatchError(index, "Each sub-request needs a path")
+        if item.get("method", "GET").upper() not in BATCH_METHODS:
+            raise BatchError(index, f"method must be one of {', '.join(BATCH_METHODS)}")
+
+
+def _lookup(results, index, fields, position):
+    if index >= position:
+        raise BatchError(position, f"${index} refers to a sub-request that has not run yet")
+    value = results[index]["body"]
+    for field in fields.split(".")[1:]:
+        try:
+            value = value[int(field)] if isinstance(value, list) else value[field]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise BatchError(position, f"${index}{fields} does not exist")
+    return value
+
+
+def substitute(value, results, position):
+    """Replace ``$<index>.<field>`` references in ``value`` with earlier results.
+
+    A string that is exactly one reference takes the referenced value as is,
+    so ids stay integers in request bodies.
+    """
+    if isinstance(value, dict):
+        return {key: substitute(item, results, position) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute(item, results, position) for item in value]
+    if not isinstance(value, str):
+        return value
+    match = REFERENCE.fullmatch(value)
+    if match:
+        return _lookup(results, int(match[1]), match[2], position)
+    return REFERENCE.sub(lambda m: str(_lookup(results, int(m[1]), m[2], position)), value)
+
+
+def _sub_request(request, method, path, body):
+    from django.core.handlers.wsgi import WSGIRequest
+
+    path, _, query_string = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    environ = {key: value for key, value in request.META.items() if key.startswith("HTTP_")}
+    environ.update({
+        "REQUEST_METHOD": method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(payload)),
+        "SERVER_NAME": request.META.get("SERVER_NAME", "localhost"),
+        "SERVER_PORT": request.META.get("SERVER_PORT", "80"),
+        "REMOTE_ADDR": request.META.get("REMOTE_ADDR", ""),
+        "wsgi.input": io.BytesIO(payload),
+        "wsgi.url_scheme": request.scheme,
+    })
+    sub = WSGIRequest(environ)
+    # REST framework's hook for pre-authenticated requests: the batch's
+    # credentials are reused instead of authenticating every sub-request.
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    # Sub-requests see the batch's uncommitted writes, which must not reach
+    # the response cache in case the batch is rolled back.
+    sub.bypass_response_cache = True
+    return sub
+
+
+def _dispatch(request, index, item, results):
+    method = item.get("method", "GET").upper()
+    path = substitute(item["path"], results, index)
+    body = substitute(item.get("body"), results, index)
+    try:
+        match = resolve(path.partition("?")[0])
+    except Resolver404:
+        raise BatchError(index, f"No route for {path}")
+    if not match.route.startswith("api/") or match.route.startswith("api/async/") or match.url_name in BATCH_EXCLUDED_ROUTES:
+        raise BatchError(index, f"{path} cannot be used in a batch")
+
+    sub = _sub_request(request, method, path, body)
+    sub.resolver_match = match
+    response = match.func(sub, *match.args, **match.kwargs)
+    if response.streaming:
+        response.close()
+        raise BatchError(index, f"{path} streams its response and cannot be used in a batch")
+    if hasattr(response, "data"):
+        content = response.data
+    else:
+        content = response.content.decode()
+        try:
+            content = json.loads(content)
+        except ValueError:
+            pass
+    return {"status": response.status_code, "body": content}
+
+
+def run_batch(request, items):
+    """Dispatch ``items`` in order inside one transaction.
+
+    Returns ``(results, committed)``. Dispatch stops at the first sub-request
+    that answers with a 4xx or 5xx status, and everything before it is
+    rolled back.
+    """
+    validate(items)
+    results = []
+    with transaction.atomic():
+        for index, item in enumerate(items):
+            results.append(_dispatch(request, index, item, results))
+            if results[-1]["status"] >= 400:
+                transaction.set_rollback(True)
+                return results, False
+    return results, True
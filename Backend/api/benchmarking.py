@@ -0,0 +1,149 @@
+import json
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from api.models import Project, Task
+
+SEED_BATCH_SIZE = 5000
+SEED_WORDS = (
+    "review", "deploy", "invoice", "refactor", "meeting", "design", "release", "backup", "migrate", "audit",
+    "onboarding", "budget", "roadmap", "benchmark", "security", "payroll", "interview", "newsletter",
+)
+
+
+@contextmanager
+def scratch_database(verbosity=0, on_disk=False):
+    """Run the block against a freshly migrated throwaway database.
+
+    Benchmarks seed hundreds of thousands of rows, so they never touch the
+    configured database; the test database is created and destroyed instead.
+    Concurrent benchmarks need ``on_disk``: SQLite's shared-cache in-memory
+    database fails concurrent writers with "table is locked" instead of
+    waiting on them like a database file does.
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    old_test_name = test_settings.get("NAME")
+    with tempfile.TemporaryDirectory() as directory:
+        if on_disk:
+            test_settings["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+            test_settings["NAME"] = old_test_name
+
+
+@contextmanager
+def database_profile(name):
+    """Switch the default connection to one of ``settings.SQLITE_PROFILES`` for the block.
+
+    Enter it before ``scratch_database`` so the benchmark database is created
+    with the profile's pragmas.
+    """
+    profile = settings.SQLITE_PROFILES[name]
+    saved = {key: connection.settings_dict.get(key) for key in ("OPTIONS", "CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+    connection.close()
+    connection.settings_dict.update({"CONN_HEALTH_CHECKS": False, **profile})
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict.update(saved)
+
+
+def seed(users, projects, tasks, deleted_every=10, batch_size=SEED_BATCH_SIZE, password="!"):
+    """Bulk insert ``users`` x ``projects`` x ``tasks`` rows and return the projects.
+
+    Every ``deleted_every``-th task is soft-deleted and every other task is
+    done. ``password`` is stored as given, so pass a hash from
+    ``make_password`` for users that should be able to sign in.
+    """
+    now = timezone.now()
+    start = User.objects.count()
+    owners = User.objects.bulk_create(
+        [User(username=f"seed-user-{start + i}", email=f"seed-user-{start + i}@example.com", password=password)
+         for i in range(users)],
+        batch_size=batch_size,
+    )
+    created_projects = Project.objects.bulk_create(
+        [Project(created_by=owner, title=f"Seed project {j}", created_date=now + timedelta(seconds=j))
+         for owner in owners for j in range(projects)],
+        batch_size=batch_size,
+    )
+
+    batch = []
+    for project in created_projects:
+        for k in range(tasks):
+            created = now + timedelta(milliseconds=k)
+            batch.append(Task(
+                report=project,
+                description=(
+                    f"{SEED_WORDS[k % len(SEED_WORDS)]} {SEED_WORDS[(k * 7 + 3) % len(SEED_WORDS)]} "
+                    f"item {k} of {project.title}"
+                ),
+                status="done" if k % 2 else "not_done",
+                created_date=created,
+                last_updated_on=created,
+                isDeleted=k % deleted_every == 0,
+            ))
+            if len(batch) >= batch_size:
+                Task.objects.bulk_create(batch)
+                batch = []
+    if batch:
+        Task.objects.bulk_create(batch)
+    Project.objects.filter(id__in=[project.id for project in created_projects]).update(**Project.task_counts())
+    return created_projects
+
+
+def wsgi_call(handler, method, url, key, data=None, content_type="application/json", scheme="Token"):
+    """Send one token-authenticated request through ``handler``; returns ``(latency_ms, status_code)``.
+
+    ``data`` is sent as JSON, or as it is when it is already bytes.
+    """
+    if not isinstance(data, bytes):
+        data = json.dumps(data) if data is not None else ""
+    environ = RequestFactory().generic(
+        method, url, data, content_type=content_type, HTTP_AUTHORIZATION=f"{scheme} {key}",
+    ).environ
+    started = time.perf_counter()
+    response = handler(environ, lambda status, headers: None)
+    b"".join(response)
+    response.close()
+    return (time.perf_counter() - started) * 1000, response.status_code
+
+
+def time_call(func, repeat):
+    """Call ``func`` ``repeat`` times and return the per-call latencies in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
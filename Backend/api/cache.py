@@ -0,0 +1,121 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _cache():
+    alias = getattr(settings, "API_RESPONSE_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        for outcome in _stats:
+            _stats[outcome] = 0
+
+
+def _generation(cache, key):
+    # A missing or evicted generation restarts at the current time, never at
+    # a value an older entry could have been stored under.
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def _user_key(user):
+    # date_joined keeps a recreated account with a reused id from seeing
+    # entries cached for its predecessor.
+    return f"{user.pk}:{user.date_joined.timestamp()}"
+
+
+def _list_key(cache, user, query_string):
+    generation = _generation(cache, f"api:gen:projects:{user.pk}")
+    return f"api:projects:{_user_key(user)}:{generation}:{query_string}"
+
+
+def _detail_key(cache, user, project_id, query_string):
+    generation = _generation(cache, f"api:gen:project:{project_id}")
+    return f"api:project:{_user_key(user)}:{project_id}:{generation}:{query_string}"
+
+
+def _get(key_func, *args):
+    # The key is returned with the entry and a miss is stored under that same
+    # key: reading the generation again after the database could pick up a
+    # bump made in between and file data read before a write under the
+    # generation meant for data read after it.
+    cache = _cache()
+    if cache is None:
+        return None, None
+    key = key_func(cache, *args)
+    entry = cache.get(key)
+    _count("hits" if entry is not None else "misses")
+    return entry, key
+
+
+def _set(key, entry):
+    cache = _cache()
+    if cache is not None and key is not None:
+        cache.set(key, entry)
+
+
+def get_project_list(request):
+    """Return ``(entry, key)``; pass ``key`` to ``set_project_list`` on a miss."""
+    if getattr(request, "bypass_response_cache", False):
+        return None, None
+    return _get(_list_key, request.user, request.META.get("QUERY_STRING", ""))
+
+
+def set_project_list(key, entry):
+    _set(key, entry)
+
+
+def get_project_detail(request, project_id):
+    """Return ``(entry, key)``; pass ``key`` to ``set_project_detail`` on a miss."""
+    if getattr(request, "bypass_response_cache", False):
+        return None, None
+    return _get(_detail_key, request.user, project_id, request.META.get("QUERY_STRING", ""))
+
+
+def set_project_detail(key, entry):
+    _set(key, entry)
+
+
+def _incr(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def _bump(key):
+    cache = _cache()
+    if cache is None:
+        return
+    _incr(cache, key)
+    # Inside a transaction, other requests can still read and cache the
+    # old rows until it commits; bump again once the write is visible.
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _incr(cache, key))
+
+
+def invalidate_project_list(user_id):
+    _bump(f"api:gen:projects:{user_id}")
+
+
+def invalidate_project(project_id):
+    _bump(f"api:gen:project:{project_id}")
@@ -0,0 +1,39 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.cache import invalidate_project_list
+from api.models import Project
+
+# Copies a project's tasks with one INSERT ... SELECT, so the rows never
+# travel through Python and cloning costs the same four statements however
+# big the project is. Ranks are copied as they are, which keeps the order,
+# and every task gets version 1, the version the new project is bumped to.
+
+_CLONE_TASKS_SQL = """
+    INSERT INTO "api_task" ("report_id", "description", "status", "created_date", "last_updated_on", "isDeleted", "rank", "version")
+    SELECT %s, "description", {status}, %s, %s, "isDeleted", "rank", 1
+    FROM "api_task"
+    WHERE "report_id" = %s {deleted}
+"""
+
+
+def clone_project(project, user, title, reset_status=False, include_deleted=False):
+    """Create a copy of ``project`` owned by ``user`` and return ``(clone, copied)``.
+
+    Deleted tasks are left out unless ``include_deleted``; with
+    ``reset_status`` every copied task starts out not done.
+    """
+    now = timezone.now()
+    sql = _CLONE_TASKS_SQL.format(
+        status="'not_done'" if reset_status else '"status"',
+        deleted="" if include_deleted else 'AND NOT "isDeleted"',
+    )
+    with transaction.atomic():
+        clone = Project.objects.create(created_by=user, title=title, created_date=now)
+        stamp = connection.ops.adapt_datetimefield_value(now)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [clone.id, stamp, stamp, project.id])
+            copied = cursor.rowcount
+        Project.bump_version(clone.id)
+    invalidate_project_list(user.id)
+    return clone, copied
@@ -0,0 +1,63 @@
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def _etag(*parts):
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def project_validators(request, project):
+    """Return ``(etag, last_modified)`` for a project detail response."""
+    last_modified = project.last_updated_on or project.created_date
+    etag = _etag("project", project.id, project.version, request.META.get("QUERY_STRING", ""))
+    return etag, last_modified.timestamp()
+
+
+LIST_STATE = {
+    "count": Count("id"), "max_id": Max("id"), "versions": Sum("version"),
+    "last_updated_on": Max("last_updated_on"), "created_date": Max("created_date"),
+}
+
+
+def project_list_validators(request, projects):
+    """Return ``(etag, last_modified)`` for a project list from one aggregate query.
+
+    Project ids are never reused, so the count plus the highest id catch
+    creates and hard deletes, and the version sum catches every other write.
+    """
+    return _list_validators(request, projects.aggregate(**LIST_STATE))
+
+
+async def aproject_list_validators(request, projects):
+    """Async version of ``project_list_validators``."""
+    return _list_validators(request, await projects.aaggregate(**LIST_STATE))
+
+
+def _list_validators(request, state):
+    etag = _etag(
+        "projects", request.user.pk, state["count"], state["max_id"], state["versions"],
+        request.META.get("QUERY_STRING", ""),
+    )
+    timestamps = [value for value in (state["last_updated_on"], state["created_date"]) if value]
+    last_modified = max(timestamps).timestamp() if timestamps else None
+    return etag, last_modified
+
+
+def not_modified(request, etag, last_modified):
+    """Return a 304 response if the client's copy is still current, else ``None``."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+KEEPALIVE_SECONDS = 15
+
+
+class Subscription:
+    def __init__(self, broker, project_id):
+        self.broker = broker
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event):
+        # Runs on the subscriber's loop. A client that falls this far behind
+        # is told to resync instead of being sent a partial history.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "project": self.project_id})
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """In-process fan-out of project events to the subscribed SSE streams.
+
+    ``publish`` may be called from any thread; each event is handed to the
+    event loop that owns the subscriber.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id):
+        subscription = Subscription(self, project_id)
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.project_id, None)
+
+    def subscriber_count(self, project_id):
+        with self._lock:
+            return len(self._subscribers.get(project_id, ()))
+
+    def publish(self, project_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down.
+                self.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+def publish(project_id, event_type, **payload):
+    broker.publish(project_id, {"type": event_type, "project": project_id, **payload})
+
+
+def publish_on_commit(project_id, event_type, **payload):
+    """Publish an event for ``project_id`` once the current transaction commits."""
+    transaction.on_commit(lambda: publish(project_id, event_type, **payload))
+
+
+def task_payload(task):
+    return {
+        "id": task["id"],
+        "description": task["description"],
+        "status": task["status"],
+        "last_updated_on": task["last_updated_on"],
+        "rank": task["rank"],
+    }
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def event_stream(project_id, keepalive=KEEPALIVE_SECONDS):
+    subscription = broker.subscribe(project_id)
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        subscription.close()
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+
+from api.benchmarking import scratch_database, seed, summarize, wsgi_call
+from api.models import Task
+
+SCENARIOS = {
+    "detail": ("GET", "/api/projects/{project}/", "/api/async/projects/{project}/"),
+    "toggle": ("PATCH", "/api/tasks/{task}/update_status/", "/api/async/tasks/{task}/update_status/"),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent throughput of the sync views under WSGI with the async views under ASGI."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=200, help="Tasks in the benchmarked project.")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+
+    def handle(self, *args, **options):
+        with scratch_database(on_disk=True), override_settings(API_RESPONSE_CACHE=None):
+            project = seed(1, 1, options["tasks"])[0]
+            token = Token.objects.create(user=project.created_by)
+            task = Task.objects.filter(report=project).first()
+
+            for scenario in options["scenario"] or sorted(SCENARIOS):
+                method, wsgi_path, asgi_path = SCENARIOS[scenario]
+                urls = {
+                    "wsgi": wsgi_path.format(project=project.id, task=task.id),
+                    "asgi": asgi_path.format(project=project.id, task=task.id),
+                }
+                for server, run in (("wsgi", self.run_wsgi), ("asgi", self.run_asgi)):
+                    started = time.perf_counter()
+                    results = run(method, urls[server], token.key, options["requests"], options["concurrency"])
+                    elapsed = time.perf_counter() - started
+                    stats = summarize([latency for latency, _ in results])
+                    errors = sum(1 for _, status in results if status >= 400)
+                    self.stdout.write(
+                        f"{scenario:7} {server}: {len(results) / elapsed:8.1f} req/s, "
+                        f"p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, {errors} errors"
+                    )
+
+    def run_wsgi(self, method, url, key, requests, concurrency):
+        handler = WSGIHandler()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(lambda _: wsgi_call(handler, method, url, key), range(requests)))
+
+    def run_asgi(self, method, url, key, requests, concurrency):
+        handler = ASGIHandler()
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+            "scheme": "http", "path": url, "raw_path": url.encode(), "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Token {key}".encode())],
+            "client": ("127.0.0.1", 0), "server": ("testserver", 80),
+        }
+
+        async def call(limit):
+            body_sent = False
+            status = 0
+
+            async def receive():
+                nonlocal body_sent
+                if not body_sent:
+                    body_sent = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # Never disconnect; Django cancels this wait when the response is done.
+                await asyncio.Event().wait()
+
+            async def send(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+
+            async with limit:
+                started = time.perf_counter()
+                await handler(dict(scope), receive, send)
+                return (time.perf_counter() - started) * 1000, status
+
+        async def main():
+            limit = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(call(limit) for _ in range(requests)))
+
+        return asyncio.run(main())
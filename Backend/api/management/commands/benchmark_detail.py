@@ -0,0 +1,44 @@
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.benchmarking import scratch_database, seed, summarize, time_call
+
+
+class Command(BaseCommand):
+    help = "Measure time, queries and peak memory per ProjectDetailView request."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        # The response cache would turn every request after the first into a hit.
+        with scratch_database(), override_settings(API_RESPONSE_CACHE=None):
+            project = seed(1, 1, options["tasks"])[0]
+            client = APIClient()
+            client.force_authenticate(user=project.created_by)
+            url = reverse("project_detail", kwargs={"project_id": project.id})
+
+            def fetch():
+                response = client.get(url)
+                response.render()
+
+            with CaptureQueriesContext(connection) as captured:
+                fetch()
+            queries = len(captured)
+            tracemalloc.start()
+            fetch()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            stats = summarize(time_call(fetch, options["repeat"]))
+
+        self.stdout.write(
+            f"{options['tasks']} tasks: {queries} queries, peak {peak / 1024 / 1024:.1f} MiB, "
+            f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms"
+        )
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.benchmarking import scratch_database, seed, summarize, time_call
+from api.models import Project, Task
+
+
+class Command(BaseCommand):
+    help = "Compare soft-delete query plans and latency with and without the composite indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--projects", type=int, default=20, help="Projects per user.")
+        parser.add_argument("--tasks", type=int, default=5000, help="Tasks per project.")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.stdout.write("Seeding %d tasks..." % (options["users"] * options["projects"] * options["tasks"]))
+            projects = seed(options["users"], options["projects"], options["tasks"])
+            project = projects[len(projects) // 2]
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            queries = {
+                "live tasks": lambda: Task.objects.filter(report=project, isDeleted=False),
+                "deleted tasks": lambda: Task.objects.filter(report=project, isDeleted=True),
+                "live tasks page": lambda: Task.objects.filter(report=project, isDeleted=False)
+                .order_by("rank", "id")[:100],
+                "done count": lambda: Task.objects.filter(report=project, isDeleted=False, status="done"),
+                "projects page": lambda: Project.objects.filter(created_by=project.created_by)
+                .order_by("created_date", "id")[:100],
+                "live projects": lambda: Project.objects.filter(created_by=project.created_by, isDeleted=False),
+            }
+
+            self.report("with indexes", queries, options["repeat"])
+            indexes = [(model, index) for model in (Project, Task) for index in model._meta.indexes]
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.remove_index(model, index)
+            self.report("without indexes", queries, options["repeat"])
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.add_index(model, index)
+
+    def report(self, label, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        for name, build in queries.items():
+            plan = build().explain().replace("\n", "; ")
+            self.stdout.write(f"  {name}: {plan}")
+            sql, params = build().query.sql_with_params()
+            with connection.cursor() as cursor:
+                stats = summarize(time_call(lambda: cursor.execute(sql, params).fetchall(), repeat))
+            self.stdout.write(f"    p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms")
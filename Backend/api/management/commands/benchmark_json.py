@@ -0,0 +1,53 @@
+import io
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api import renderers
+from api.benchmarking import scratch_database, seed, summarize, time_call
+from api.views import ProjectDetailView
+
+PAIRS = {
+    "stdlib": (JSONRenderer, JSONParser),
+    "fast": (renderers.FastJSONRenderer, renderers.FastJSONParser),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's stdlib JSON renderer and parser with api.renderers on a large project detail payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write("orjson is not installed; the fast renderer falls back to the stdlib encoder.")
+        with scratch_database(), override_settings(API_RESPONSE_CACHE=None):
+            project = seed(1, 1, options["tasks"])[0]
+            client = APIClient()
+            client.force_authenticate(user=project.created_by)
+            url = reverse("project_detail", kwargs={"project_id": project.id})
+            payload = client.get(url).data
+            body = JSONRenderer().render(payload)
+            self.stdout.write(f"Payload: {options['tasks']} tasks, {len(body) / 1024:.0f} KiB")
+
+            for name, (renderer_class, parser_class) in PAIRS.items():
+                render = summarize(time_call(lambda: renderer_class().render(payload), options["repeat"]))
+                parse = summarize(time_call(lambda: parser_class().parse(io.BytesIO(body)), options["repeat"]))
+
+                def request():
+                    response = client.get(url)
+                    response.render()
+
+                with mock.patch.object(ProjectDetailView, "renderer_classes", [renderer_class]):
+                    view = summarize(time_call(request, options["repeat"]))
+                self.stdout.write(
+                    f"{name:6}: render p50 {render['p50_ms']} ms, parse p50 {parse['p50_ms']} ms, "
+                    f"detail request p50 {view['p50_ms']} ms (p95 {view['p95_ms']} ms)"
+                )
@@ -0,0 +1,342 @@
+import itertools
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from api import urls
+from api.benchmarking import scratch_database, seed, summarize, wsgi_call
+from api.models import Project, PurgeJob, Task
+from api.sync import encode_since, encode_version
+
+SEED_PASSWORD = "benchmark-password"
+METRICS_TOKEN = "benchmark-metrics"
+
+# Routes the runner cannot drive as a request/response pair.
+SKIPPED = {
+    "project_events": "Server-Sent Events stream; it never completes",
+}
+
+
+class Fixtures:
+    """Seeded rows the scenarios draw their targets from."""
+
+    def __init__(self, projects, rng):
+        self.rng = rng
+        self.keys = {}
+        for project in projects:
+            if project.created_by_id not in self.keys:
+                self.keys[project.created_by_id] = Token.objects.create(user=project.created_by).key
+        self.owners = {project.id: project.created_by_id for project in projects}
+        self.projects = list(self.owners)
+        self.tasks = list(Task.objects.filter(report_id__in=self.projects).values_list("id", "report_id"))
+        self.emails = dict(Project.objects.filter(id__in=self.projects).values_list("created_by_id", "created_by__email"))
+        self.purge_jobs = {
+            owner: PurgeJob.objects.create(kind="project", requested_by_id=owner, status="done").id
+            for owner in self.keys
+        }
+        self.serial = itertools.count()
+
+    def project(self):
+        project_id = self.rng.choice(self.projects)
+        return project_id, self.keys[self.owners[project_id]]
+
+    def task(self):
+        task_id, project_id = self.rng.choice(self.tasks)
+        return task_id, self.keys[self.owners[project_id]]
+
+    def new_project(self):
+        owner = self.rng.choice(list(self.keys))
+        project = Project.objects.create(created_by_id=owner, title="Throwaway", created_date=timezone.now())
+        return project.id, self.keys[owner]
+
+    def new_task(self):
+        project_id, key = self.project()
+        now = timezone.now()
+        task = Task.objects.create(report_id=project_id, description="Throwaway", created_date=now, last_updated_on=now)
+        return task.id, key
+
+
+def _project_get(path):
+    def prepare(f):
+        project_id, key = f.project()
+        return "GET", path.format(project=project_id), key, None
+    return prepare
+
+
+def _project_write(method, path):
+    def prepare(f):
+        project_id, key = f.project()
+        return method, path.format(project=project_id), key, None
+    return prepare
+
+
+def _task_write(method, path, body=None):
+    def prepare(f):
+        task_id, key = f.task()
+        return method, path.format(task=task_id), key, body
+    return prepare
+
+
+def _owner_get(path):
+    def prepare(f):
+        return "GET", path, f.rng.choice(list(f.keys.values())), None
+    return prepare
+
+
+def _signup(f):
+    name = f"bench-{next(f.serial)}"
+    body = {"first_name": name, "email": f"{name}@example.com", "password": "pw", "confirm_password": "pw"}
+    return "POST", "/api/signup/", None, body
+
+
+def _signin(f):
+    return "POST", "/api/signin/", None, {"email": f.rng.choice(list(f.emails.values())), "password": SEED_PASSWORD}
+
+
+def _create_project(f):
+    return "POST", "/api/create_project/", f.rng.choice(list(f.keys.values())), {"title": "Benchmark project"}
+
+
+def _update_title(f):
+    project_id, key = f.project()
+    return "PATCH", f"/api/projects/{project_id}/update_title/", key, {"title": f"Renamed {next(f.serial)}"}
+
+
+def _changes(f):
+    # Incremental sync from the project's current version.
+    project_id, key = f.project()
+    since = encode_version(Project.objects.values_list("version", flat=True).get(id=project_id))
+    return "GET", f"/api/projects/{project_id}/changes?since={since}", key, None
+
+
+def _changed_since(path):
+    # Incremental export: only what changed in the last minute.
+    def prepare(f):
+        since = encode_since(timezone.now() - timedelta(minutes=1))
+        return "GET", f"{path}?since={since}", f.rng.choice(list(f.keys.values())), None
+    return prepare
+
+
+def _add_task(f):
+    project_id, key = f.project()
+    return "POST", f"/api/projects/{project_id}/add_task/", key, {"description": "Benchmark task"}
+
+
+def _bulk(f):
+    project_id, key = f.project()
+    ids = [task_id for task_id, task_project in f.rng.sample(f.tasks, 50) if task_project == project_id]
+    return "POST", f"/api/projects/{project_id}/tasks/bulk/", key, {"action": "mark_done", "ids": ids}
+
+
+def _move(f):
+    task_id, project_id = f.rng.choice(f.tasks)
+    neighbours = [other for other, other_project in f.rng.sample(f.tasks, 50) if other_project == project_id]
+    return "PATCH", f"/api/tasks/{task_id}/move/", f.keys[f.owners[project_id]], {
+        "after": None, "before": neighbours[0] if neighbours and neighbours[0] != task_id else None,
+    }
+
+
+def _import(f):
+    lines = "".join(f"- [{'x' if i % 3 else ' '}] Imported task {i} \n\n" for i in range(200))
+    body = encode_multipart(BOUNDARY, {"file": SimpleUploadedFile("tasks.md", f"# Imported\n\n{lines}".encode())})
+    return "POST", "/api/projects/import/", f.rng.choice(list(f.keys.values())), body, MULTIPART_CONTENT
+
+
+def _search(f):
+    return "GET", "/api/search/?q=" + f.rng.choice(("payroll", "release notes", "item 12", "onboard")), \
+        f.rng.choice(list(f.keys.values())), None
+
+
+def _batch(f):
+    project_id, key = f.project()
+    return "POST", "/api/batch/", key, {"requests": [
+        {"method": "POST", "path": f"/api/projects/{project_id}/add_task/", "body": {"description": "Batched task"}},
+        {"method": "PATCH", "path": "/api/tasks/$0.id/update_status/"},
+        {"method": "GET", "path": f"/api/projects/{project_id}/"},
+    ]}
+
+
+def _purge_job(f):
+    owner = f.rng.choice(list(f.keys))
+    return "GET", f"/api/purge_jobs/{f.purge_jobs[owner]}/", f.keys[owner], None
+
+
+def _project_actual_delete(f):
+    project_id, key = f.new_project()
+    return "DELETE", f"/api/projects/{project_id}/actual_delete/", key, None
+
+
+def _task_actual_delete(f):
+    task_id, key = f.new_task()
+    return "DELETE", f"/api/tasks/{task_id}/actual_delete/", key, None
+
+
+# Route name -> (weight in the mix, prepare). ``prepare`` picks a target,
+# creating throwaway rows for destructive routes, and returns the request.
+SCENARIOS = {
+    "project-list": (20, _owner_get("/api/projects/")),
+    "project_detail": (15, _project_get("/api/projects/{project}/")),
+    "update_task_status": (15, _task_write("PATCH", "/api/tasks/{task}/update_status/")),
+    "add_task": (10, _add_task),
+    "project_changes": (5, _changes),
+    "search": (5, _search),
+    "move_task": (5, _move),
+    "update_task_description": (
+        5, _task_write("PATCH", "/api/tasks/{task}/update_description/", {"description": "Edited"})
+    ),
+    "profile_api": (3, _owner_get("/api/profile/")),
+    "delete-task": (3, _task_write("DELETE", "/api/tasks/{task}/delete/")),
+    "restore-task": (3, _task_write("DELETE", "/api/tasks/{task}/restore/")),
+    "project_export": (2, _project_get("/api/projects/{project}/export.md")),
+    "get_pac": (2, _owner_get("/api/get_pac/")),
+    "create_project": (2, _create_project),
+    "import_checklist": (1, _import),
+    "projects_archive": (1, _changed_since("/api/projects/export.zip")),
+    "update_project_title": (2, _update_title),
+    "clone_project": (1, _project_write("POST", "/api/projects/{project}/clone/")),
+    "bulk_tasks": (2, _bulk),
+    "project_delete": (1, _project_write("DELETE", "/api/projects/{project}/delete/")),
+    "project_restore": (1, _project_write("DELETE", "/api/projects/{project}/restore/")),
+    "project_actual_delete": (1, _project_actual_delete),
+    "delete-actual-task": (1, _task_actual_delete),
+    "purge_job": (1, _purge_job),
+    "batch": (1, _batch),
+    "metrics": (1, lambda f: ("GET", "/api/metrics/", METRICS_TOKEN, None, "application/json", "Bearer")),
+    "signin": (1, _signin),
+    "signup": (1, _signup),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every route in api/urls.py with a weighted read/write mix against seeded data and report "
+        "throughput and p50/p95/p99 latency per route, optionally as JSON for comparing runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--projects", type=int, default=10, help="Projects per user.")
+        parser.add_argument("--tasks", type=int, default=200, help="Tasks per project.")
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--warmup", type=int, default=200, help="Requests run before measuring.")
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the request mix.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--baseline", help="JSON results of an earlier run to compare against.")
+
+    def handle(self, *args, **options):
+        routes = {pattern.name for pattern in urls.urlpatterns}
+        missing = routes - set(SCENARIOS) - set(SKIPPED)
+        if missing:
+            raise CommandError(f"No benchmark scenario for: {', '.join(sorted(missing))}")
+
+        # Server errors are counted per route; keep their tracebacks out of the report.
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        with scratch_database(on_disk=True), override_settings(
+            PURGE_WORKER_IN_PROCESS=False, METRICS_TOKEN=METRICS_TOKEN
+        ):
+            self.stdout.write("Seeding %d tasks..." % (options["users"] * options["projects"] * options["tasks"]))
+            projects = seed(options["users"], options["projects"], options["tasks"], password=make_password(SEED_PASSWORD))
+            fixtures = Fixtures(projects, random.Random(options["seed"]))
+            names = list(SCENARIOS)
+            weights = [SCENARIOS[name][0] for name in names]
+
+            def plan(count):
+                return [
+                    (name, SCENARIOS[name][1](fixtures))
+                    for name in fixtures.rng.choices(names, weights, k=count)
+                ]
+
+            handler = WSGIHandler()
+
+            def call(item):
+                name, request = item
+                return name, wsgi_call(handler, *request)
+
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                list(pool.map(call, plan(options["warmup"])))
+                calls = plan(options["requests"])
+                started = time.perf_counter()
+                results = list(pool.map(call, calls))
+                elapsed = time.perf_counter() - started
+
+        report = self.report(results, elapsed, options)
+        self.print_report(report, self.load(options["baseline"]))
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def report(self, results, elapsed, options):
+        samples = defaultdict(list)
+        errors = defaultdict(int)
+        for name, (latency, status) in results:
+            samples[name].append(latency)
+            if status >= 500:
+                errors[name] += 1
+
+        endpoints = {}
+        for name in sorted(samples):
+            stats = summarize(samples[name])
+            # Requests per second for this route alone on one thread.
+            stats["throughput_rps"] = round(len(samples[name]) / (sum(samples[name]) / 1000), 1)
+            stats["errors"] = errors[name]
+            endpoints[name] = stats
+        return {
+            "timestamp": timezone.now().isoformat(),
+            "config": {
+                key: options[key] for key in ("users", "projects", "tasks", "requests", "warmup", "concurrency", "seed")
+            },
+            "overall": {
+                "requests": len(results),
+                "elapsed_s": round(elapsed, 3),
+                "throughput_rps": round(len(results) / elapsed, 1),
+                "errors": sum(errors.values()),
+            },
+            "endpoints": endpoints,
+            "skipped": SKIPPED,
+        }
+
+    def load(self, path):
+        if not path:
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def print_report(self, report, baseline):
+        self.stdout.write(
+            f"{'route':26}{'count':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+            + ("   p50/p99 vs baseline" if baseline else "")
+        )
+        for name, stats in report["endpoints"].items():
+            line = (
+                f"{name:26}{stats['count']:>7}{stats['throughput_rps']:>9}{stats['p50_ms']:>10}"
+                f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>8}"
+            )
+            previous = (baseline or {}).get("endpoints", {}).get(name)
+            if previous:
+                line += "   " + " / ".join(
+                    f"{(stats[key] - previous[key]) / previous[key]:+.0%}" if previous[key] else "n/a"
+                    for key in ("p50_ms", "p99_ms")
+                )
+            self.stdout.write(line)
+        overall = report["overall"]
+        self.stdout.write(
+            f"Overall: {overall['requests']} requests in {overall['elapsed_s']}s, "
+            f"{overall['throughput_rps']} req/s, {overall['errors']} errors"
+        )
+        for name, reason in report["skipped"].items():
+            self.stdout.write(f"Skipped {name}: {reason}")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from api.benchmarking import scratch_database, seed, summarize, time_call
+from api.search import naive_search, search
+
+
+class Command(BaseCommand):
+    help = "Compare FTS5 search latency with a naive icontains scan on a seeded corpus."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--projects", type=int, default=20, help="Projects per user.")
+        parser.add_argument("--tasks", type=int, default=5000, help="Tasks per project.")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--query", action="append", help="Query to time; may be repeated.")
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.stdout.write("Seeding %d tasks..." % (options["users"] * options["projects"] * options["tasks"]))
+            projects = seed(options["users"], options["projects"], options["tasks"])
+            # A user in the middle of the table, so a scan cannot stop early.
+            user = projects[len(projects) // 2].created_by
+
+            for query in options["query"] or ["payroll", "interv", "item 4999"]:
+                for name, func in (("fts5", search), ("icontains", naive_search)):
+                    found = len(func(user, query)["tasks"])
+                    stats = summarize(time_call(lambda: func(user, query), options["repeat"]))
+                    self.stdout.write(
+                        f"{query!r:12} {name:9}: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms ({found} hits)"
+                    )
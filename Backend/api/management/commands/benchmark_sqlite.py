@@ -0,0 +1,67 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+
+from api.benchmarking import database_profile, scratch_database, seed, summarize, wsgi_call
+from api.models import Task
+
+# (weight, method, url, body) for the write mix each thread draws from.
+WRITES = (
+    (7, "PATCH", "/api/tasks/{task}/update_status/", None),
+    (2, "POST", "/api/projects/{project}/add_task/", {"description": "Benchmark task"}),
+    (1, "PATCH", "/api/tasks/{task}/update_description/", {"description": "Renamed by benchmark"}),
+)
+
+
+class Command(BaseCommand):
+    help = "Hammer the task write endpoints from many threads under each SQLite profile in settings.SQLITE_PROFILES."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=4)
+        parser.add_argument("--projects", type=int, default=5, help="Projects per user.")
+        parser.add_argument("--tasks", type=int, default=200, help="Tasks per project.")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--profile", choices=sorted(settings.SQLITE_PROFILES), action="append")
+
+    def handle(self, *args, **options):
+        # Lock failures are counted below; keep their tracebacks out of the report.
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        for profile in options["profile"] or sorted(settings.SQLITE_PROFILES):
+            with database_profile(profile), scratch_database(on_disk=True), \
+                    override_settings(API_RESPONSE_CACHE=None, PURGE_WORKER_IN_PROCESS=False):
+                projects = seed(options["users"], options["projects"], options["tasks"])
+                owners = {project.id: project.created_by for project in projects}
+                keys = {user.pk: Token.objects.create(user=user).key for user in set(owners.values())}
+                tasks = list(Task.objects.values_list("id", "report_id"))
+                calls = self.plan(tasks, owners, keys, options["requests"])
+
+                handler = WSGIHandler()
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                    results = list(pool.map(lambda call: wsgi_call(handler, *call), calls))
+                elapsed = time.perf_counter() - started
+
+                stats = summarize([latency for latency, _ in results])
+                errors = sum(1 for _, status in results if status >= 500)
+                self.stdout.write(
+                    f"{profile:10}: {len(results) / elapsed:8.1f} writes/s, p50 {stats['p50_ms']} ms, "
+                    f"p99 {stats['p99_ms']} ms, {errors} errors ({options['concurrency']} threads)"
+                )
+
+    def plan(self, tasks, owners, keys, requests):
+        rng = random.Random(0)
+        weights = [weight for weight, *_ in WRITES]
+        calls = []
+        for _ in range(requests):
+            _, method, url, body = rng.choices(WRITES, weights)[0]
+            task_id, project_id = rng.choice(tasks)
+            calls.append((method, url.format(task=task_id, project=project_id), keys[owners[project_id].pk], body))
+        return calls
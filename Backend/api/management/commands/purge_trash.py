@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.purge import request_trash_purge, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Delete tasks and projects that have been in the trash longer than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Defaults to TRASH_RETENTION_DAYS.")
+        parser.add_argument("--queue-only", action="store_true", help="Leave the job to run_purge_worker.")
+
+    def handle(self, *args, **options):
+        job = request_trash_purge(options["days"])
+        self.stdout.write(f"Queued trash purge job {job.id} for items deleted before {job.older_than:%Y-%m-%d %H:%M}.")
+        if options["queue_only"]:
+            return
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.stdout.write(self.style.SUCCESS(f"Job {job.id} {job.status}: {job.deleted}/{job.total} tasks deleted."))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.models import Project
+from api.rebalance import projects_needing_rebalance, rebalance_project
+
+
+class Command(BaseCommand):
+    help = "Rewrite long task ranks as short, evenly spaced ones, keeping every project's task order."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, action="append", help="Rebalance this project. Repeatable.")
+        parser.add_argument("--all", action="store_true", help="Rebalance every project, not only those with long ranks.")
+
+    def handle(self, *args, **options):
+        if options["project"]:
+            project_ids = options["project"]
+        elif options["all"]:
+            project_ids = list(Project.all_objects.values_list("id", flat=True))
+        else:
+            project_ids = projects_needing_rebalance()
+
+        for project_id in project_ids:
+            started = time.perf_counter()
+            count = rebalance_project(project_id)
+            self.stdout.write(f"Project {project_id}: {count} tasks in {time.perf_counter() - started:.2f}s")
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {len(project_ids)} projects."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the FTS5 search tables and triggers and rebuild them from tasks and projects."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stdout.write("Full-text search needs SQLite; searches use icontains instead.")
+            return
+        install_search_index(connection)
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from api.models import Project
+
+COUNT_FIELDS = ("task_count", "done_count", "deleted_count")
+
+
+class Command(BaseCommand):
+    help = "Recount every project's live, done and deleted tasks and repair counters that have drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drifted projects without fixing them.")
+
+    def handle(self, *args, **options):
+        actual = {f"actual_{field}": expression for field, expression in Project.task_counts().items()}
+        drifted = models.Q()
+        for field in COUNT_FIELDS:
+            drifted |= ~models.Q(**{field: models.F(f"actual_{field}")})
+
+        with transaction.atomic():
+            projects = Project.objects.annotate(**actual).filter(drifted)
+            for project in projects.values("id", *COUNT_FIELDS, *actual):
+                self.stdout.write(
+                    "Project %d: " % project["id"] + ", ".join(
+                        f"{field} {project[field]} -> {project[f'actual_{field}']}" for field in COUNT_FIELDS
+                    )
+                )
+            if options["dry_run"]:
+                count = projects.count()
+            else:
+                count = Project.objects.filter(id__in=projects.values("id")).update(**Project.task_counts())
+
+        verb = "drifted" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"{count} project(s) {verb}."))
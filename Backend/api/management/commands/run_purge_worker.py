@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.purge import claim_job, get_chunk_size, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued hard deletes and trash purges in bounded chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty.")
+        parser.add_argument("--poll", type=float, default=5.0, help="Seconds between checks of an empty queue.")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows per transaction.")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"] or get_chunk_size()
+        while True:
+            job = claim_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll"])
+                continue
+
+            started = time.perf_counter()
+            run_job(job, chunk_size)
+            job.refresh_from_db()
+            self.stdout.write(
+                f"Job {job.id} ({job.kind}) {job.status}: {job.deleted}/{job.total} tasks deleted "
+                f"in {time.perf_counter() - started:.2f}s" + (f" - {job.error}" if job.error else "")
+            )
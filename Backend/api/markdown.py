@@ -0,0 +1,153 @@
+import re
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.cache import invalidate_project, invalidate_project_list
+from api.events import publish_on_commit
+from api.models import Project, Task
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Checklist lines as project_markdown() and the frontend's generateMarkdown()
+# write them ("- [x] description "), plus the other GitHub list markers.
+CHECKLIST_ITEM = re.compile(r"^\s*[-*+]\s+\[([ xX])\]\s?(.*?)\s*$")
+TITLE = re.compile(r"^#\s+(.*?)\s*$")
+DESCRIPTION_MAX_LENGTH = 255
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_TASKS = 100000
+DEFAULT_IMPORT_TITLE = "Imported checklist"
+
+
+def export_filename(project):
+    title = "".join(c for c in project.title if c not in '"\\/\r\n') or "project"
+    return f"{title}-tasks.md"
+
+
+def _task_lines(descriptions, mark):
+    for description in descriptions:
+        yield f"- [{mark}] {description or ''} \n\n"
+
+
+def _descriptions(tasks, chunk_size):
+    # (report, status, rank, id) index order, so no sort step.
+    return tasks.order_by("rank", "id").values_list("description", flat=True).iterator(chunk_size=chunk_size)
+
+
+def _buffered(lines, chunk_size):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def render_checklist(project, pending, completed, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield ``project`` as Markdown, given its pending and completed task descriptions in order."""
+    # The summary comes from the project's task counters, not a COUNT over its tasks.
+    yield (
+        f"\n# {project.title}\n\n"
+        f"### Summary : {project.done_count}/{project.task_count} Compleated\n  \n"
+        "## Pending\n\n"
+    )
+    yield from _buffered(_task_lines(pending, " "), chunk_size)
+    yield "  \n## Completed\n  \n"
+    yield from _buffered(_task_lines(completed, "x"), chunk_size)
+
+
+def project_markdown(project, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the project checklist in the format of the frontend's generateMarkdown().
+
+    Tasks are read with a chunked iterator and written out chunk by chunk, so
+    memory use does not depend on the size of the project.
+    """
+    tasks = Task.objects.filter(report=project, isDeleted=False)
+    yield from render_checklist(
+        project,
+        _descriptions(tasks.filter(status="not_done"), chunk_size),
+        _descriptions(tasks.filter(status="done"), chunk_size),
+        chunk_size,
+    )
+
+
+class InvalidChecklist(ValueError):
+    pass
+
+
+class ChecklistParser:
+    """Iterate over the tasks of a Markdown checklist, one line at a time.
+
+    Yields ``(description, status)`` for each ``- [ ]`` / ``- [x]`` item
+    with a description, in file order. ``lines`` may be an uploaded file:
+    Django reads it in chunks, so memory use does not depend on its size.
+    The first ``# heading`` is kept as ``title``; every other line is
+    skipped.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.title = None
+
+    def __iter__(self):
+        for number, line in enumerate(self.lines, 1):
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode("utf-8-sig" if number == 1 else "utf-8")
+                except UnicodeDecodeError:
+                    raise InvalidChecklist(f"Line {number} is not valid UTF-8")
+            item = CHECKLIST_ITEM.match(line)
+            if item:
+                if item[2]:
+                    yield item[2][:DESCRIPTION_MAX_LENGTH], "done" if item[1] in "xX" else "not_done"
+            elif self.title is None:
+                title = TITLE.match(line)
+                if title and title[1]:
+                    self.title = title[1][:255]
+
+
+def import_checklist(lines, user, project=None, title=None, batch_size=IMPORT_BATCH_SIZE):
+    """Add the tasks of a Markdown checklist to ``project``, or to a new project.
+
+    A new project is titled ``title``, else after the checklist's heading.
+    Tasks are inserted ``batch_size`` at a time with ``bulk_create``, all in
+    one transaction, and keep the file's order. Returns ``(project, created,
+    imported)``; raises ``InvalidChecklist``, writing nothing, for a file
+    with no tasks or more than IMPORT_MAX_TASKS.
+    """
+    parser = ChecklistParser(lines)
+    created = project is None
+    imported = 0
+    now = timezone.now()
+    with transaction.atomic():
+        # A new project starts at version 0.
+        version = Project.read_next_version(project.id) if project is not None else 1
+        batch = []
+        for description, status in parser:
+            if project is None:
+                # The heading comes before the first task.
+                project = Project.objects.create(
+                    created_by=user, title=title or parser.title or DEFAULT_IMPORT_TITLE, created_date=now
+                )
+            batch.append(Task(
+                report=project, description=description, status=status, created_date=now, last_updated_on=now,
+                version=version,
+            ))
+            if len(batch) >= batch_size:
+                imported += len(Task.objects.bulk_create(batch))
+                batch = []
+                if imported > IMPORT_MAX_TASKS:
+                    raise InvalidChecklist(f"A checklist can have at most {IMPORT_MAX_TASKS} tasks")
+        imported += len(Task.objects.bulk_create(batch))
+        if imported > IMPORT_MAX_TASKS:
+            raise InvalidChecklist(f"A checklist can have at most {IMPORT_MAX_TASKS} tasks")
+        if not imported:
+            raise InvalidChecklist("No checklist items found")
+        Project.bump_version(project.id)
+        if not created:
+            publish_on_commit(project.id, "tasks.bulk", action="import", count=imported)
+    invalidate_project_list(user.id)
+    invalidate_project(project.id)
+    return project, created, imported
@@ -0,0 +1,222 @@
+import bisect
+import contextvars
+import hmac
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+
+from api.cache import cache_stats
+
+# Per-request timing for the API. MetricsMiddleware times each /api/ request,
+# an execute wrapper on every database connection adds up its queries, and
+# the totals go out in a Server-Timing header and into per-route histograms
+# served in Prometheus text format by ``metrics_view``. The histograms live in
+# this process only; with several workers each one reports its own. Scrapers
+# send ``Authorization: Bearer <METRICS_TOKEN>``; staff can also read them from
+# an admin session.
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_REQUEST_MAX_STATEMENTS = 50
+
+slow_request_logger = logging.getLogger("api.slow_requests")
+
+_current = contextvars.ContextVar("api_request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("started", "queries", "sql_seconds", "statements")
+
+    def __init__(self, capture_sql):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = [] if capture_sql else None
+
+
+def record_sql(execute, sql, params, many, context):
+    """Database execute wrapper that charges each query to the current request, if any.
+
+    The request is found through a context variable, so queries that async
+    views run in worker threads are counted too.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.queries += 1
+        metrics.sql_seconds += elapsed
+        if metrics.statements is not None and len(metrics.statements) < SLOW_REQUEST_MAX_STATEMENTS:
+            metrics.statements.append((elapsed, sql))
+
+
+def install_sql_timer(sender, connection, **kwargs):
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.durations = {}
+        self.queries = {}
+        self.sql_seconds = {}
+        self.responses = {}
+
+    def observe(self, route, method, status_code, metrics, duration):
+        labels = (route, method)
+        with self._lock:
+            self.durations.setdefault(labels, Histogram(DURATION_BUCKETS)).observe(duration)
+            self.queries.setdefault(labels, Histogram(QUERY_BUCKETS)).observe(metrics.queries)
+            self.sql_seconds[labels] = self.sql_seconds.get(labels, 0.0) + metrics.sql_seconds
+            status_labels = (route, method, f"{status_code // 100}xx")
+            self.responses[status_labels] = self.responses.get(status_labels, 0) + 1
+
+    def render(self):
+        lines = []
+        with self._lock:
+            self._render_histograms(
+                lines, "api_request_duration_seconds", "Time to produce the response.", self.durations
+            )
+            self._render_histograms(lines, "api_request_queries", "Database queries per request.", self.queries)
+            lines += [
+                "# HELP api_request_sql_seconds_total Time spent in database queries.",
+                "# TYPE api_request_sql_seconds_total counter",
+            ]
+            for (route, method), seconds in sorted(self.sql_seconds.items()):
+                lines.append(f'api_request_sql_seconds_total{{route="{route}",method="{method}"}} {seconds:.6f}')
+            lines += ["# HELP api_responses_total Responses by status class.", "# TYPE api_responses_total counter"]
+            for (route, method, status_class), count in sorted(self.responses.items()):
+                lines.append(
+                    f'api_responses_total{{route="{route}",method="{method}",status="{status_class}"}} {count}'
+                )
+        stats = cache_stats()
+        lines += [
+            "# HELP api_response_cache_requests_total Project list/detail cache lookups by outcome.",
+            "# TYPE api_response_cache_requests_total counter",
+            f'api_response_cache_requests_total{{outcome="hit"}} {stats["hits"]}',
+            f'api_response_cache_requests_total{{outcome="miss"}} {stats["misses"]}',
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(self, lines, name, help_text, histograms):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (route, method), histogram in sorted(histograms.items()):
+            labels = f'route="{route}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            count = cumulative + histogram.counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+
+registry = Registry()
+
+
+def _route(request):
+    match = request.resolver_match
+    return match.route if match is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    """Time each /api/ request and report it in ``Server-Timing`` and the metrics registry.
+
+    Streaming responses are timed up to the point the view returns them.
+    With SLOW_REQUEST_MS set, requests slower than that are logged to
+    ``api.slow_requests`` with their SQL.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith("/api/"):
+            return self.get_response(request)
+        metrics, token = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not request.path.startswith("/api/"):
+            return await self.get_response(request)
+        metrics, token = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics)
+
+    def _start(self):
+        metrics = RequestMetrics(capture_sql=getattr(settings, "SLOW_REQUEST_MS", None) is not None)
+        return metrics, _current.set(metrics)
+
+    def _finish(self, request, response, metrics):
+        duration = time.perf_counter() - metrics.started
+        route = _route(request)
+        registry.observe(route, request.method, response.status_code, metrics, duration)
+        response["Server-Timing"] = (
+            f'db;desc="{metrics.queries} queries";dur={metrics.sql_seconds * 1000:.2f}, '
+            f"total;dur={duration * 1000:.2f}"
+        )
+
+        slow_ms = getattr(settings, "SLOW_REQUEST_MS", None)
+        if slow_ms is not None and duration * 1000 >= slow_ms:
+            slow_request_logger.warning(
+                "Slow request %s %s (%s): %.1f ms, %d queries, %.1f ms in SQL\n%s",
+                request.method, request.get_full_path(), route, duration * 1000, metrics.queries,
+                metrics.sql_seconds * 1000,
+                "\n".join(f"  {elapsed * 1000:8.2f} ms  {sql}" for elapsed, sql in metrics.statements),
+            )
+        return response
+
+
+def _may_read_metrics(request):
+    token = getattr(settings, "METRICS_TOKEN", None)
+    header = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+        return True
+    # Only the admin's session login; the API's own tokens are for app users.
+    return request.user.is_active and request.user.is_staff
+
+
+def metrics_view(request):
+    if not _may_read_metrics(request):
+        response = JsonResponse({"error": "Authentication required"}, status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
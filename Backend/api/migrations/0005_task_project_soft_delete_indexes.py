@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_project_isdeleted_task_isdeleted'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_by', 'created_date', 'id'], name='project_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('isDeleted', False)), fields=['created_by', 'created_date', 'id'], name='project_owner_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('isDeleted', False)), fields=['report', 'created_date', 'id'], name='task_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('isDeleted', True)), fields=['report', 'created_date', 'id'], name='task_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('isDeleted', False)), fields=['report', 'status'], name='task_live_status_idx'),
+        ),
+    ]
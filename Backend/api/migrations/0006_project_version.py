@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_task_project_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='last_updated_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_project_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('deleted_on', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['report', 'last_updated_on'], name='task_report_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tombstones', to='api.project'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['project', 'deleted_on'], name='tombstone_project_deleted_idx'),
+        ),
+    ]
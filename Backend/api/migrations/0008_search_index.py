@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from api.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in ('api_task_fts', 'api_project_fts'):
+        for trigger in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_{trigger}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_task_sync'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
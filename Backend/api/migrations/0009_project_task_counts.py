@@ -0,0 +1,57 @@
+from django.db import migrations, models
+from django.db.models import Count, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tasks(apps, schema_editor):
+    Project = apps.get_model('api', 'Project')
+    Task = apps.get_model('api', 'Task')
+
+    def count(**filters):
+        tasks = Task.objects.filter(report=models.OuterRef('pk'), **filters).order_by()
+        return Coalesce(Subquery(tasks.values('report').annotate(count=Count('id')).values('count')), 0)
+
+    Project.objects.using(schema_editor.connection.alias).update(
+        task_count=count(isDeleted=False),
+        done_count=count(isDeleted=False, status='done'),
+        deleted_count=count(isDeleted=True),
+    )
+
+
+# Adding the columns rebuilds api_project on SQLite, which the search triggers reference.
+def drop_search_triggers(apps, schema_editor):
+    from api.search import drop_search_triggers
+    drop_search_triggers(schema_editor.connection)
+
+
+def install_search_triggers(apps, schema_editor):
+    from api.search import install_search_index
+    install_search_index(schema_editor.connection, rebuild=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_search_triggers, install_search_triggers),
+        migrations.AddField(
+            model_name='project',
+            name='deleted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='done_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(install_search_triggers, drop_search_triggers),
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
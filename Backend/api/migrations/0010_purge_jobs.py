@@ -0,0 +1,42 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_project_task_counts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='purge_requested_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='PurgeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'project'), ('trash', 'trash')], max_length=10)),
+                ('status', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], default='queued', max_length=10)),
+                ('project_id', models.BigIntegerField(blank=True, null=True)),
+                ('older_than', models.DateTimeField(blank=True, null=True)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('deleted', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_on', models.DateTimeField(blank=True, null=True)),
+                ('finished_on', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purge_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='purgejob_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+import api.ranking
+from django.db import migrations, models
+
+
+def rank_tasks(apps, schema_editor):
+    # Existing tasks keep the order they were listed in: creation order.
+    Task = apps.get_model('api', 'Task')
+    tasks = Task.objects.using(schema_editor.connection.alias)
+    project_ids = tasks.order_by().values_list('report_id', flat=True).distinct()
+    for project_id in list(project_ids):
+        ids = list(tasks.filter(report_id=project_id).order_by('created_date', 'id').values_list('id', flat=True))
+        tasks.bulk_update(
+            [Task(id=task_id, rank=rank) for task_id, rank in zip(ids, api.ranking.spaced_ranks(len(ids)))],
+            ['rank'], batch_size=500,
+        )
+
+
+# Adding the column rebuilds api_task on SQLite, which the search triggers reference.
+def drop_search_triggers(apps, schema_editor):
+    from api.search import drop_search_triggers
+    drop_search_triggers(schema_editor.connection)
+
+
+def install_search_triggers(apps, schema_editor):
+    from api.search import install_search_index
+    install_search_index(schema_editor.connection, rebuild=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_purge_jobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_search_triggers, install_search_triggers),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_live_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_deleted_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_live_status_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default=api.ranking.next_rank, max_length=255),
+        ),
+        migrations.RunPython(rank_tasks, migrations.RunPython.noop),
+        migrations.RunPython(install_search_triggers, drop_search_triggers),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('isDeleted', False)), fields=['report', 'rank', 'id'], name='task_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('isDeleted', True)), fields=['report', 'rank', 'id'], name='task_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('isDeleted', False)), fields=['report', 'status', 'rank', 'id'], name='task_live_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['report', 'rank', 'id'], name='task_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_task_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purgejob',
+            name='heartbeat_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
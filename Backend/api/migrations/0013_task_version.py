@@ -0,0 +1,54 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+# Adding the column rebuilds api_task on SQLite, which the search triggers reference.
+def drop_search_triggers(apps, schema_editor):
+    from api.search import drop_search_triggers
+    drop_search_triggers(schema_editor.connection)
+
+
+def install_search_triggers(apps, schema_editor):
+    from api.search import install_search_index
+    install_search_index(schema_editor.connection, rebuild=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_purgejob_heartbeat_on'),
+    ]
+
+    # Existing rows keep version 0: timestamp cursors from before this
+    # migration are rejected, so every client starts again from a baseline.
+    operations = [
+        migrations.RunPython(drop_search_triggers, install_search_triggers),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_report_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tasktombstone',
+            name='tombstone_project_deleted_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(install_search_triggers, drop_search_triggers),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['report', 'version'], name='task_report_version_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['project', 'version'], name='tombstone_project_version_idx'),
+        ),
+    ]
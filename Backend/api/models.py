@@ -1,18 +1,114 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from api.ranking import RANK_MAX_LENGTH, next_rank
 
 # Create your models here.
 
 
+class ProjectManager(models.Manager):
+    # Projects queued for a hard delete are gone as far as the API is concerned.
+    def get_queryset(self):
+        return super().get_queryset().filter(purge_requested_on__isnull=True)
+
+
 class Project(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reports")
     title = models.CharField(max_length=255)
     isDeleted = models.BooleanField(default=False)
     created_date = models.DateTimeField()    
+    # Bumped on every write to the project or its tasks; drives the ETags.
+    version = models.PositiveIntegerField(default=0)
+    last_updated_on = models.DateTimeField(blank=True, null=True)
+    # Denormalized for the project list; single-task writes adjust them and
+    # bulk writes recount them.
+    task_count = models.PositiveIntegerField(default=0)
+    done_count = models.PositiveIntegerField(default=0)
+    deleted_count = models.PositiveIntegerField(default=0)
+    # Set when a hard delete is queued; the purge worker removes the rows.
+    purge_requested_on = models.DateTimeField(blank=True, null=True)
+
+    objects = ProjectManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_by", "created_date", "id"], name="project_owner_created_idx"),
+            models.Index(
+                fields=["created_by", "created_date", "id"], condition=models.Q(isDeleted=False),
+                name="project_owner_live_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def mark_updated(self):
+        self.version = models.F("version") + 1
+        self.last_updated_on = timezone.now()
+
+    @staticmethod
+    def task_counts():
+        """Subqueries that recount a project's live, done and deleted tasks, for use in an UPDATE.
+
+        Each one is answered from the matching partial index on Task.
+        """
+        def count(**filters):
+            tasks = Task.objects.filter(report=models.OuterRef("pk"), **filters).order_by()
+            return Coalesce(
+                models.Subquery(tasks.values("report").annotate(count=models.Count("id")).values("count")),
+                0,
+            )
+
+        return {
+            "task_count": count(isDeleted=False),
+            "done_count": count(isDeleted=False, status="done"),
+            "deleted_count": count(isDeleted=True),
+        }
+
+    @classmethod
+    def next_version(cls, project_id):
+        """The version the project's next ``bump_version`` gives it, as an expression.
+
+        Task writes stamp rows with it in the same statement, so it is read
+        under the write lock; see ``api.sync``.
+        """
+        return models.Subquery(cls.all_objects.filter(id=project_id).values("version")) + 1
+
+    @classmethod
+    def read_next_version(cls, project_id):
+        """``next_version()`` read with one query, for stamping many rows at once.
+
+        Call it inside the transaction that writes them: SQLite transactions
+        are serializable, so it cannot go stale before they commit.
+        """
+        return cls.all_objects.filter(id=project_id).values_list("version", flat=True).get() + 1
+
+    @classmethod
+    def _version_changes(cls, deltas):
+        changes = {"version": models.F("version") + 1, "last_updated_on": timezone.now()}
+        if deltas is None:
+            changes.update(cls.task_counts())
+        else:
+            changes.update({field: models.F(field) + delta for field, delta in deltas.items() if delta})
+        return changes
+
+    @classmethod
+    def bump_version(cls, project_id, deltas=None):
+        """Record a write to the project's tasks in one UPDATE: bump the version and update the counters.
+
+        ``deltas`` maps counter fields to the amounts they changed by, which
+        costs nothing however many tasks there are; leave it out to recount
+        them instead, for writes that touch an unknown number of tasks.
+        """
+        cls.objects.filter(id=project_id).update(**cls._version_changes(deltas))
+
+    @classmethod
+    async def abump_version(cls, project_id, deltas=None):
+        await cls.objects.filter(id=project_id).aupdate(**cls._version_changes(deltas))
+
 class Task(models.Model):
     report = models.ForeignKey(Project, related_name='projects', on_delete=models.CASCADE)
     description = models.CharField(max_length=255, blank=True, null=True)
@@ -20,10 +116,86 @@ class Task(models.Model):
     created_date = models.DateTimeField()
     last_updated_on = models.DateTimeField()
     isDeleted = models.BooleanField(default=False)
+    # Manual order within the project; see api.ranking.
+    rank = models.CharField(max_length=RANK_MAX_LENGTH, default=next_rank)
+    # Project.next_version() when the task was last written; the delta sync cursor.
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Django renders boolean lookups on SQLite as a bare column, which
+            # a composite (report, isDeleted) index cannot serve, so each soft
+            # delete state gets its own partial index instead.
+            models.Index(
+                fields=["report", "rank", "id"], condition=models.Q(isDeleted=False), name="task_live_idx"
+            ),
+            models.Index(
+                fields=["report", "rank", "id"], condition=models.Q(isDeleted=True), name="task_deleted_idx"
+            ),
+            models.Index(
+                fields=["report", "status", "rank", "id"], condition=models.Q(isDeleted=False),
+                name="task_live_status_idx"
+            ),
+            # The unpaginated detail read lists live and deleted tasks together.
+            models.Index(fields=["report", "rank", "id"], name="task_rank_idx"),
+            models.Index(fields=["report", "version"], name="task_report_version_idx"),
+        ]
 
     def __str__(self):
         return self.description
     
+class TaskTombstone(models.Model):
+    # Left behind by hard deletes so delta sync can report them.
+    project = models.ForeignKey(Project, related_name='tombstones', on_delete=models.CASCADE)
+    task_id = models.BigIntegerField()
+    deleted_on = models.DateTimeField()
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "version"], name="tombstone_project_version_idx"),
+        ]
+
+    @classmethod
+    def record(cls, project_id, task_ids, version=None):
+        """Leave tombstones for ``task_ids``; call it in the transaction that deletes them.
+
+        ``version`` defaults to ``Project.read_next_version()``; pass
+        ``Project.next_version()`` instead to save the query for a single task.
+        """
+        now = timezone.now()
+        if version is None:
+            version = Project.read_next_version(project_id)
+        cls.objects.bulk_create([
+            cls(project_id=project_id, task_id=task_id, deleted_on=now, version=version) for task_id in task_ids
+        ])
+    
+class PurgeJob(models.Model):
+    # Queue for api.purge: hard deletes of one project, or of everything
+    # that has sat in the trash since before ``older_than``.
+    KIND_CHOICES = (('project', 'project'), ('trash', 'trash'))
+    STATUS_CHOICES = (('queued', 'queued'), ('running', 'running'), ('done', 'done'), ('failed', 'failed'))
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    requested_by = models.ForeignKey(User, blank=True, null=True, on_delete=models.SET_NULL, related_name='purge_jobs')
+    project_id = models.BigIntegerField(blank=True, null=True)
+    older_than = models.DateTimeField(blank=True, null=True)
+    total = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_on = models.DateTimeField(default=timezone.now)
+    started_on = models.DateTimeField(blank=True, null=True)
+    # Refreshed by the worker after every chunk; a running job whose
+    # heartbeat is older than PURGE_LEASE_SECONDS is claimed again.
+    heartbeat_on = models.DateTimeField(blank=True, null=True)
+    finished_on = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"], name="purgejob_status_idx"),
+        ]
+
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     git_pac = models.CharField(max_length=255, blank=True, null=True)
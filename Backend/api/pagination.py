@@ -0,0 +1,84 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+PAGINATION_PARAMS = ("page_size", "cursor", "deleted_cursor")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value, pk):
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    raw = f"{value}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key="created_date"):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit("|", 1)
+        if key == "created_date":
+            value = parse_datetime(value)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+    if not value:
+        raise InvalidCursor("Invalid cursor")
+    return value, pk
+
+
+def is_paginated(request):
+    return any(param in request.GET for param in PAGINATION_PARAMS)
+
+
+def get_page_size(request):
+    try:
+        page_size = int(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise InvalidCursor("Invalid page_size")
+    if page_size < 1:
+        raise InvalidCursor("Invalid page_size")
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+def _page_queryset(queryset, cursor, page_size, key):
+    queryset = queryset.order_by(key, "id")
+    if cursor:
+        value, pk = decode_cursor(cursor, key)
+        queryset = queryset.filter(Q(**{f"{key}__gt": value}) | Q(**{key: value, "id__gt": pk}))
+    return queryset[:page_size + 1]
+
+
+def _finish_page(rows, page_size, key):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last[key], last["id"])
+        else:
+            next_cursor = encode_cursor(getattr(last, key), last.id)
+    return rows, next_cursor
+
+
+def keyset_page(queryset, cursor, page_size, key="created_date"):
+    """Return ``(rows, next_cursor)`` for one page ordered by ``(key, id)``.
+
+    The cursor is turned into a range condition instead of an OFFSET, so every
+    page costs the same no matter how deep it is. ``queryset`` may be a
+    ``.values()`` queryset as long as it includes ``id`` and ``key``.
+    """
+    return _finish_page(list(_page_queryset(queryset, cursor, page_size, key)), page_size, key)
+
+
+async def akeyset_page(queryset, cursor, page_size, key="created_date"):
+    """Async version of ``keyset_page``."""
+    rows = [row async for row in _page_queryset(queryset, cursor, page_size, key)]
+    return _finish_page(rows, page_size, key)
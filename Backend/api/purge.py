@@ -0,0 +1,235 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from api.cache import invalidate_project, invalidate_project_list
+from api.events import publish_on_commit
+from api.models import Project, PurgeJob, Task, TaskTombstone
+
+# Hard deletes run here instead of in the request: the rows go in chunks of
+# PURGE_CHUNK_SIZE, each in its own short transaction, so SQLite's write lock
+# is never held for longer than one chunk. Jobs are queued in PurgeJob and
+# drained by ``manage.py run_purge_worker`` or, with PURGE_WORKER_IN_PROCESS,
+# by a thread in the web process. A worker that dies mid-job leaves it
+# running; once its heartbeat is older than PURGE_LEASE_SECONDS the next
+# worker to look at the queue takes it over, which is safe because every
+# chunk deletes whatever rows are still there.
+
+DEFAULT_PURGE_CHUNK_SIZE = 500
+DEFAULT_PURGE_LEASE_SECONDS = 300
+DEFAULT_TRASH_RETENTION_DAYS = 30
+
+logger = logging.getLogger(__name__)
+
+
+def get_chunk_size():
+    return getattr(settings, "PURGE_CHUNK_SIZE", DEFAULT_PURGE_CHUNK_SIZE)
+
+
+def job_payload(job):
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "project_id": job.project_id,
+        "total": job.total,
+        "deleted": job.deleted,
+        "error": job.error,
+        "created_on": job.created_on,
+        "started_on": job.started_on,
+        "finished_on": job.finished_on,
+    }
+
+
+def request_project_purge(project, user):
+    """Hide ``project`` from the API and queue the deletion of its rows.
+
+    Two single-row writes, whatever the size of the project.
+    """
+    with transaction.atomic():
+        Project.objects.filter(id=project.id).update(purge_requested_on=timezone.now())
+        job = PurgeJob.objects.create(
+            kind="project", requested_by=user, project_id=project.id,
+            total=project.task_count + project.deleted_count,
+        )
+        transaction.on_commit(wake_worker)
+    return job
+
+
+def request_trash_purge(days=None):
+    """Queue the deletion of every task and project soft-deleted more than ``days`` days ago.
+
+    Called from cron through ``manage.py purge_trash``, which runs the job
+    itself, so the in-process worker is not woken.
+    """
+    if days is None:
+        days = getattr(settings, "TRASH_RETENTION_DAYS", DEFAULT_TRASH_RETENTION_DAYS)
+    return PurgeJob.objects.create(kind="trash", older_than=timezone.now() - timedelta(days=days))
+
+
+def get_lease():
+    return timedelta(seconds=getattr(settings, "PURGE_LEASE_SECONDS", DEFAULT_PURGE_LEASE_SECONDS))
+
+
+def claim_job():
+    """Mark the oldest queued or abandoned job as running and return it, or ``None`` if there is none.
+
+    A job is abandoned when it is running but its heartbeat is older than
+    the lease. The claim is a conditional UPDATE on the status and heartbeat
+    that were read, so concurrent workers never claim the same job.
+    """
+    while True:
+        now = timezone.now()
+        claimable = Q(status="queued") | Q(status="running", heartbeat_on__lt=now - get_lease())
+        job = PurgeJob.objects.filter(claimable).order_by("id").first()
+        if job is None:
+            return None
+        if job.status == "running":
+            logger.warning("Purge job %s was abandoned; resuming it", job.id)
+        claimed = PurgeJob.objects.filter(id=job.id, status=job.status, heartbeat_on=job.heartbeat_on).update(
+            status="running", started_on=job.started_on or now, heartbeat_on=now
+        )
+        if claimed:
+            job.status, job.started_on, job.heartbeat_on = "running", job.started_on or now, now
+            return job
+
+
+def run_job(job, chunk_size=None):
+    chunk_size = chunk_size or get_chunk_size()
+    try:
+        if job.kind == "project":
+            _purge_project(job, job.project_id, chunk_size)
+        else:
+            _purge_trash(job, chunk_size)
+    except Exception as e:
+        logger.exception("Purge job %s failed", job.id)
+        PurgeJob.objects.filter(id=job.id).update(status="failed", error=str(e), finished_on=timezone.now())
+    else:
+        PurgeJob.objects.filter(id=job.id).update(status="done", finished_on=timezone.now())
+
+
+def run_pending_jobs(chunk_size=None):
+    """Run queued jobs until the queue is empty; returns how many ran."""
+    count = 0
+    while (job := claim_job()) is not None:
+        run_job(job, chunk_size)
+        count += 1
+    return count
+
+
+def _advance(job, deleted):
+    PurgeJob.objects.filter(id=job.id).update(deleted=F("deleted") + deleted, heartbeat_on=timezone.now())
+
+
+def _delete_chunks(queryset, chunk_size, job=None):
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                return
+            queryset.model._base_manager.filter(id__in=ids).delete()
+            if job is not None:
+                _advance(job, len(ids))
+
+
+def _purge_project(job, project_id, chunk_size):
+    _delete_chunks(Task.objects.filter(report_id=project_id), chunk_size, job)
+    _delete_chunks(TaskTombstone.objects.filter(project_id=project_id), chunk_size)
+    with transaction.atomic():
+        Project.all_objects.filter(id=project_id).delete()
+
+
+def _purge_trash(job, chunk_size):
+    tasks = Task.objects.filter(
+        isDeleted=True, last_updated_on__lt=job.older_than, report__purge_requested_on__isnull=True
+    )
+    projects = Project.all_objects.filter(isDeleted=True, purge_requested_on__isnull=True).filter(
+        Q(last_updated_on__lt=job.older_than) | Q(last_updated_on__isnull=True, created_date__lt=job.older_than)
+    )
+    expired = list(projects.values_list("id", "created_by_id", "task_count", "deleted_count"))
+    # Tasks of expiring projects are counted with their project, not twice.
+    tasks = tasks.exclude(report_id__in=[project_id for project_id, *_ in expired])
+    total = tasks.count() + sum(live + deleted for _, _, live, deleted in expired)
+    PurgeJob.objects.filter(id=job.id).update(total=total)
+
+    while True:
+        with transaction.atomic():
+            rows = list(tasks.values_list("id", "report_id", "report__created_by_id")[:chunk_size])
+            if not rows:
+                break
+            removed = defaultdict(list)
+            for task_id, project_id, owner_id in rows:
+                removed[(project_id, owner_id)].append(task_id)
+            for (project_id, _), task_ids in removed.items():
+                TaskTombstone.record(project_id, task_ids)
+            Task.objects.filter(id__in=[row[0] for row in rows]).delete()
+            for (project_id, _), task_ids in removed.items():
+                Project.bump_version(project_id)
+                publish_on_commit(project_id, "tasks.bulk", action="purge", count=len(task_ids))
+            _advance(job, len(rows))
+        for project_id, owner_id in removed:
+            invalidate_project_list(owner_id)
+            invalidate_project(project_id)
+
+    for project_id, owner_id, _, _ in expired:
+        Project.all_objects.filter(id=project_id).update(purge_requested_on=timezone.now())
+        invalidate_project_list(owner_id)
+        invalidate_project(project_id)
+        publish_on_commit(project_id, "project.removed")
+        _purge_project(job, project_id, chunk_size)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+_wake = threading.Event()
+
+
+def wake_worker():
+    """Start the in-process worker thread, or tell a running one to look at the queue again."""
+    global _worker
+    if not getattr(settings, "PURGE_WORKER_IN_PROCESS", False):
+        return
+    with _worker_lock:
+        _wake.set()
+        if _worker is None:
+            _worker = threading.Thread(target=_drain, name="purge-worker", daemon=True)
+            _worker.start()
+
+
+_resumed = False
+
+
+def resume_worker(**kwargs):
+    """``request_started`` receiver: wake the worker on a process's first request.
+
+    Picks up jobs queued while no web process was running and jobs left
+    behind by one that died.
+    """
+    global _resumed
+    if not _resumed:
+        _resumed = True
+        wake_worker()
+
+
+def _drain():
+    global _worker
+    try:
+        while True:
+            _wake.clear()
+            run_pending_jobs()
+            with _worker_lock:
+                if not _wake.is_set():
+                    _worker = None
+                    return
+    except Exception:
+        logger.exception("Purge worker stopped")
+        with _worker_lock:
+            _worker = None
+    finally:
+        connection.close()
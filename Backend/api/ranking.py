@@ -0,0 +1,91 @@
+import string
+import threading
+import time
+
+# Manual task order. Each task has a ``rank`` string and a project's tasks
+# are listed in (rank, id) order. Ranks are compared byte by byte, as SQLite
+# compares TEXT, so a task can be moved by giving it any rank that sorts
+# between its new neighbours: one row is written per move, however long the
+# list is.
+#
+# New tasks get a fixed-width key made from the clock, so they go to the end
+# without reading the current last rank. A key between two neighbours is
+# their midpoint as base 62 fractions; it grows by about one character every
+# six moves into the same gap, and ``api.rebalance`` rewrites a project's
+# ranks as short, evenly spaced keys once one gets longer than
+# RANK_REBALANCE_LENGTH.
+
+DIGITS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+RANK_WIDTH = 10
+# Fixed-width keys end in a nonzero digit so a midpoint never needs a
+# trailing zero, which would make two different keys the same fraction.
+RANK_SUFFIX = "V"
+RANK_MAX_LENGTH = 255
+RANK_REBALANCE_LENGTH = 32
+
+_last_value = 0
+_lock = threading.Lock()
+
+
+def _encode(value):
+    digits = []
+    for _ in range(RANK_WIDTH):
+        value, digit = divmod(value, len(DIGITS))
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)) + RANK_SUFFIX
+
+
+def next_rank():
+    """Rank for a task added at the end of its project.
+
+    Keys come from the clock in microseconds and increase strictly within a
+    process, so tasks created together keep the order they were created in.
+    """
+    global _last_value
+    with _lock:
+        _last_value = max(time.time_ns() // 1000, _last_value + 1)
+        return _encode(_last_value)
+
+
+def spaced_ranks(count):
+    """``count`` increasing keys spread evenly below the current ``next_rank()``."""
+    upper = max(time.time_ns() // 1000, count + 1)
+    return [_encode((i + 1) * upper // (count + 1)) for i in range(count)]
+
+
+def _midpoint(low, high):
+    # ``low`` < ``high`` as fractions; "" is 0 and None is 1.
+    if high is not None:
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else DIGITS[0]) == high[n]:
+            n += 1
+        if n:
+            return high[:n] + _midpoint(low[n:], high[n:])
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else len(DIGITS)
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def rank_between(before, after):
+    """Return a rank that sorts after ``before`` and before ``after``.
+
+    Either may be ``None`` for the start or end of the list. Raises
+    ``ValueError`` unless ``before`` sorts strictly before ``after``.
+    """
+    if after is None:
+        # Stay below the keys next_rank() hands out from now on, so tasks
+        # added later still go to the end.
+        after = next_rank()
+        if before is not None and before >= after:
+            return before + RANK_SUFFIX
+    elif before is not None and before >= after:
+        raise ValueError(f"{before!r} does not sort before {after!r}")
+    return _midpoint(before or "", after)
+
+
+def needs_rebalance(rank):
+    return len(rank) > RANK_REBALANCE_LENGTH
@@ -0,0 +1,95 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.functions import Length
+
+from api.cache import invalidate_project, invalidate_project_list
+from api.events import publish_on_commit
+from api.models import Project, Task
+from api.ranking import RANK_REBALANCE_LENGTH, spaced_ranks
+
+# Rank rebalancing (see api.ranking). Moves that produce a rank longer than
+# RANK_REBALANCE_LENGTH queue their project here; with
+# RANK_REBALANCE_IN_PROCESS a thread in the web process rewrites its ranks
+# after the move commits, otherwise ``manage.py rebalance_task_ranks`` does.
+
+_REBALANCE_SQL = 'UPDATE "api_task" SET "rank" = %s, "version" = %s WHERE "id" = %s'
+
+logger = logging.getLogger(__name__)
+
+
+def rebalance_project(project_id):
+    """Give a project's tasks short, evenly spaced ranks without changing their order.
+
+    The whole project is rewritten in one transaction, so readers never see
+    a mix of old and new ranks. Each task gets a new ``version`` so delta
+    sync sends the new ranks; ``last_updated_on`` is left alone, as it dates
+    user edits and drives the trash retention clock. Returns the number of
+    tasks rewritten.
+    """
+    with transaction.atomic():
+        owner_id = Project.all_objects.filter(id=project_id).values_list("created_by_id", flat=True).first()
+        if owner_id is None:
+            return 0
+        ids = list(Task.objects.filter(report_id=project_id).order_by("rank", "id").values_list("id", flat=True))
+        version = Project.read_next_version(project_id)
+        # One prepared UPDATE by primary key per task; bulk_update's CASE
+        # expressions are far slower on big projects, and SQLite's write
+        # lock is held for the whole rewrite.
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                _REBALANCE_SQL,
+                [(rank, version, task_id) for task_id, rank in zip(ids, spaced_ranks(len(ids)))],
+            )
+        Project.bump_version(project_id, {})
+        publish_on_commit(project_id, "tasks.bulk", action="rebalance", count=len(ids))
+    invalidate_project_list(owner_id)
+    invalidate_project(project_id)
+    return len(ids)
+
+
+def projects_needing_rebalance():
+    return list(
+        Task.objects.annotate(rank_length=Length("rank")).filter(rank_length__gt=RANK_REBALANCE_LENGTH)
+        .order_by().values_list("report_id", flat=True).distinct()
+    )
+
+
+_pending = set()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def schedule_rebalance(project_id):
+    """Rebalance the project in a background thread once the current transaction commits."""
+    if getattr(settings, "RANK_REBALANCE_IN_PROCESS", False):
+        transaction.on_commit(lambda: _enqueue(project_id))
+
+
+def _enqueue(project_id):
+    global _worker
+    with _worker_lock:
+        _pending.add(project_id)
+        if _worker is None:
+            _worker = threading.Thread(target=_drain, name="rank-rebalance", daemon=True)
+            _worker.start()
+
+
+def _drain():
+    global _worker
+    try:
+        while True:
+            with _worker_lock:
+                if not _pending:
+                    _worker = None
+                    return
+                project_id = _pending.pop()
+            rebalance_project(project_id)
+    except Exception:
+        logger.exception("Rank rebalance worker stopped")
+        with _worker_lock:
+            _worker = None
+    finally:
+        connection.close()
@@ -0,0 +1,50 @@
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson writes datetimes itself, in the same ISO 8601 form as DRF's encoder
+# (aware UTC values end in "Z"), so no per-value Python call is made for them.
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Decimals, lazy translations, querysets and the rest of what DRF's encoder knows.
+    return _fallback_encoder.default(obj)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """``JSONRenderer`` backed by orjson when it is installed.
+
+    Falls back to DRF's stdlib encoder without orjson, and for requests that
+    ask for an indent orjson cannot produce.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) not in (None, 0):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` backed by orjson when it is installed."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read() if stream is not None else b"")
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
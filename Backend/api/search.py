@@ -0,0 +1,145 @@
+import re
+
+from django.db import connection
+
+from api.models import Project, Task
+
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 200
+
+# Each FTS5 row carries an ``owner`` token ("u<user id>") next to the text, so
+# MATCH narrows to one user's rows inside the index before ranking instead of
+# ranking every user's matches and filtering afterwards.
+SEARCH_TABLES = {
+    "api_task_fts": {
+        "content": "api_task",
+        "column": "description",
+        "owner": "(SELECT created_by_id FROM api_project WHERE id = {row}.report_id)",
+        "rebuild": "SELECT t.id, t.description, 'u' || p.created_by_id FROM api_task t JOIN api_project p ON p.id = t.report_id",
+    },
+    "api_project_fts": {
+        "content": "api_project",
+        "column": "title",
+        "owner": "{row}.created_by_id",
+        "rebuild": "SELECT id, title, 'u' || created_by_id FROM api_project",
+    },
+}
+
+
+def _schema_sql(fts_table, content, column, owner, rebuild):
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({column}, owner)",
+        f"DROP TRIGGER IF EXISTS {fts_table}_insert",
+        f"DROP TRIGGER IF EXISTS {fts_table}_delete",
+        f"DROP TRIGGER IF EXISTS {fts_table}_update",
+        f"""CREATE TRIGGER {fts_table}_insert AFTER INSERT ON {content} BEGIN
+            INSERT INTO {fts_table}(rowid, {column}, owner) VALUES (new.id, new.{column}, 'u' || {owner.format(row="new")});
+        END""",
+        f"""CREATE TRIGGER {fts_table}_delete AFTER DELETE ON {content} BEGIN
+            DELETE FROM {fts_table} WHERE rowid = old.id;
+        END""",
+        f"""CREATE TRIGGER {fts_table}_update AFTER UPDATE OF {column} ON {content} BEGIN
+            UPDATE {fts_table} SET {column} = new.{column} WHERE rowid = new.id;
+        END""",
+    ]
+
+
+def install_search_index(using=connection, rebuild=True):
+    """Create the FTS5 tables and their sync triggers, then refill them from tasks and projects.
+
+    Safe to run repeatedly. Migrations that make Django rebuild api_task or
+    api_project on SQLite call ``drop_search_triggers`` first, since the
+    triggers reference both tables, and this afterwards to put them back.
+    """
+    if using.vendor != "sqlite":
+        return
+    with using.cursor() as cursor:
+        for fts_table, spec in SEARCH_TABLES.items():
+            for statement in _schema_sql(fts_table, **spec):
+                cursor.execute(statement)
+            if rebuild:
+                cursor.execute(f"DELETE FROM {fts_table}")
+                cursor.execute(f"INSERT INTO {fts_table}(rowid, {spec['column']}, owner) {spec['rebuild']}")
+
+
+def drop_search_triggers(using=connection):
+    if using.vendor != "sqlite":
+        return
+    with using.cursor() as cursor:
+        for fts_table in SEARCH_TABLES:
+            for trigger in ("insert", "delete", "update"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{trigger}")
+
+
+def fts_query(query, column):
+    """Turn free text into an FTS5 query on ``column`` that prefix-matches every word."""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return ""
+    return f"{column} : (" + " ".join(f'"{word}"*' for word in words) + ")"
+
+
+def search(user, query, limit=DEFAULT_SEARCH_LIMIT):
+    """Return the user's tasks and projects matching ``query``, best matches first."""
+    if connection.vendor != "sqlite":
+        return naive_search(user, query, limit)
+    if not fts_query(query, "description"):
+        return {"tasks": [], "projects": []}
+    owner = f"owner : u{user.pk}"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT t.id, t.description, t.status, t."isDeleted", p.id, p.title
+            FROM api_task_fts
+            JOIN api_task t ON t.id = api_task_fts.rowid
+            JOIN api_project p ON p.id = t.report_id AND p.purge_requested_on IS NULL
+            WHERE api_task_fts MATCH %s
+            ORDER BY api_task_fts.rank
+            LIMIT %s
+            """,
+            [f"{owner} AND {fts_query(query, 'description')}", limit],
+        )
+        tasks = [
+            {
+                "id": task_id, "description": description, "status": task_status, "isDeleted": bool(is_deleted),
+                "project_id": project_id, "project_title": project_title,
+            }
+            for task_id, description, task_status, is_deleted, project_id, project_title in cursor.fetchall()
+        ]
+        cursor.execute(
+            """
+            SELECT p.id, p.title, p."isDeleted"
+            FROM api_project_fts
+            JOIN api_project p ON p.id = api_project_fts.rowid AND p.purge_requested_on IS NULL
+            WHERE api_project_fts MATCH %s
+            ORDER BY api_project_fts.rank
+            LIMIT %s
+            """,
+            [f"{owner} AND {fts_query(query, 'title')}", limit],
+        )
+        projects = [
+            {"id": project_id, "title": title, "isDeleted": bool(is_deleted)}
+            for project_id, title, is_deleted in cursor.fetchall()
+        ]
+    return {"tasks": tasks, "projects": projects}
+
+
+def naive_search(user, query, limit=DEFAULT_SEARCH_LIMIT):
+    """``icontains`` scan with the same result shape; used off SQLite and as the benchmark baseline."""
+    tasks = Task.objects.filter(
+        report__created_by=user, report__purge_requested_on__isnull=True, description__icontains=query
+    ).values(
+        "id", "description", "status", "isDeleted", "report_id", "report__title"
+    )[:limit]
+    projects = Project.objects.filter(created_by=user, title__icontains=query).values("id", "title", "isDeleted")[:limit]
+    return {
+        "tasks": [
+            {
+                "id": task["id"], "description": task["description"], "status": task["status"],
+                "isDeleted": task["isDeleted"], "project_id": task["report_id"], "project_title": task["report__title"],
+            }
+            for task in tasks
+        ],
+        "projects": list(projects),
+    }
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import re
+from datetime import timedelta
+
+from django.utils.dateparse import parse_datetime
+
+from api.models import Task, TaskTombstone
+
+# Delta sync of one project. Every task write stamps the rows it touches,
+# and the tombstones of hard deletes, with Project.next_version(), read in
+# the statement that writes them, and then bumps the project's version. A
+# row that commits after a client read the version therefore always has a
+# higher one, so the version makes a cursor that cannot miss late commits
+# the way a timestamp taken before the write lock can. A row can come twice,
+# if a client syncs between the row's write and the bump; clients apply
+# changes as upserts.
+
+# Timestamp cursors (the project archive) are moved back a little to pick up
+# rows that committed late. Rows in the overlap are sent twice.
+SYNC_OVERLAP = timedelta(seconds=1)
+
+SYNC_TASK_FIELDS = ("id", "description", "status", "created_date", "last_updated_on", "isDeleted", "rank")
+
+
+class InvalidSince(ValueError):
+    pass
+
+
+def encode_since(moment):
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_since(since):
+    try:
+        moment = parse_datetime(base64.urlsafe_b64decode(since + "=" * (-len(since) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        moment = None
+    if moment is None:
+        raise InvalidSince("Invalid since cursor")
+    return moment
+
+
+def encode_version(version):
+    return base64.urlsafe_b64encode(f"v{version}".encode()).decode().rstrip("=")
+
+
+def decode_version(since):
+    try:
+        value = base64.urlsafe_b64decode(since + "=" * (-len(since) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        value = ""
+    match = re.fullmatch(r"v([0-9]+)", value)
+    if match is None:
+        raise InvalidSince("Invalid since cursor")
+    return int(match[1])
+
+
+def project_changes(project, since=None):
+    """Return everything in ``project`` that changed after the ``since`` cursor.
+
+    Without a cursor every task is returned, which gives a client its
+    baseline. ``project`` must have been read before this is called: its
+    version is the next cursor.
+    """
+    tasks = Task.objects.filter(report=project)
+    removed = []
+    if since:
+        version = decode_version(since)
+        tasks = tasks.filter(version__gt=version)
+        removed = list(
+            TaskTombstone.objects.filter(project=project, version__gt=version).values_list("task_id", flat=True)
+        )
+        # Task writes bump the version too, so the project is sent with them.
+        project_changed = project.version > version
+    else:
+        project_changed = True
+
+    return {
+        "cursor": encode_version(project.version),
+        "project": {
+            "id": project.id,
+            "title": project.title,
+            "isDeleted": project.isDeleted,
+            "last_updated_on": project.last_updated_on,
+        } if project_changed else None,
+        "tasks": list(tasks.values(*SYNC_TASK_FIELDS)),
+        "removed": removed,
+    }
@@ -0,0 +1,85 @@
+import io
+import zipfile
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from api.models import Project, Task
+from api.markdown import project_markdown
+from api.sync import encode_since
+
+class ProjectArchiveTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="ArchiveUser", email="archive@example.com", password="archivepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.projects = [self.create_project(f"Project {i}", tasks=i + 1) for i in range(3)]
+        self.archive_url = reverse('projects_archive')
+
+    def create_project(self, title, tasks, owner=None, **fields):
+        project = Project.objects.create(
+            title=title, created_by=owner or self.user, created_date=timezone.now(), **fields
+        )
+        for i in range(tasks):
+            Task.objects.create(
+                report=project, description=f"{title} task {i}", status="done" if i % 2 else "not_done",
+                created_date=timezone.now(), last_updated_on=timezone.now(), isDeleted=i == 2,
+            )
+        Project.bump_version(project.id)
+        return Project.objects.get(id=project.id)
+
+    def download(self, **params):
+        response = self.client.get(self.archive_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], "application/zip")
+        return response, zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+    def test_archive_has_one_checklist_per_project(self):
+        self.create_project("Someone else's", tasks=1, owner=User.objects.create_user(
+            username="Other", email="other@example.com", password="otherpassword"
+        ))
+        trashed = self.create_project("Old", tasks=1, isDeleted=True)
+
+        response, archive = self.download()
+        self.assertEqual(archive.testzip(), None)
+        self.assertEqual(archive.namelist(), [
+            *(f"{project.id}-{project.title}-tasks.md" for project in self.projects),
+            f"trash/{trashed.id}-Old-tasks.md",
+        ])
+        for project in self.projects:
+            self.assertEqual(
+                archive.read(f"{project.id}-{project.title}-tasks.md").decode(),
+                "".join(project_markdown(project)),
+            )
+
+    def test_changed_since(self):
+        response, archive = self.download()
+        cursor = response['X-Export-Cursor']
+
+        Project.objects.filter(id__in=[p.id for p in self.projects]).update(
+            last_updated_on=timezone.now() - timedelta(hours=1)
+        )
+        self.client.post(reverse('add_task', kwargs={'project_id': self.projects[1].id}), {"description": "New"})
+        _, archive = self.download(since=cursor)
+        self.assertEqual(archive.namelist(), [f"{self.projects[1].id}-Project 1-tasks.md"])
+        self.assertIn("- [ ] New", archive.read(archive.namelist()[0]).decode())
+
+        _, archive = self.download(since=encode_since(timezone.now() + timedelta(hours=1)))
+        self.assertEqual(archive.namelist(), [])
+        self.assertEqual(self.client.get(self.archive_url, {"since": "nope"}).status_code, 400)
+
+    async def test_archive_streams_under_asgi(self):
+        token = await Token.objects.acreate(user=self.user)
+        response = await self.async_client.get(self.archive_url, headers={"Authorization": f"Token {token.key}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertEqual(archive.testzip(), None)
+        self.assertEqual(len(archive.namelist()), len(self.projects))
@@ -0,0 +1,86 @@
+import asyncio
+from unittest import mock
+
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from api.models import Project, Task
+from datetime import datetime
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="AsyncUser", email="async@example.com", password="asyncpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.project = Project.objects.create(
+            title="Async Project", created_by=self.user, created_date=datetime.now(), task_count=1
+        )
+        self.task = Task.objects.create(
+            report=self.project, description="Task", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.headers = {"Authorization": f"Token {self.token.key}"}
+
+    async def test_project_list_and_detail(self):
+        response = await self.async_client.get(reverse('async-project-list'), headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["title"], "Async Project")
+
+        url = reverse('async_project_detail', kwargs={'project_id': self.project.id})
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual([task["description"] for task in response.json()["tasks"]], ["Task"])
+        response = await self.async_client.get(url, headers={**self.headers, "If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_add_and_toggle_task(self):
+        response = await self.async_client.post(
+            reverse('async_add_task', kwargs={'project_id': self.project.id}),
+            {"description": "New"}, content_type="application/json", headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["description"], "New")
+
+        response = await self.async_client.patch(
+            reverse('async_update_task_status', kwargs={'task_id': self.task.id}), headers=self.headers
+        )
+        self.assertEqual(response.json()["status"], "done")
+        self.assertEqual(await Project.objects.filter(id=self.project.id).values_list("version", flat=True).aget(), 2)
+
+    async def test_body_must_be_a_json_object(self):
+        for method, url in (
+            (self.async_client.post, reverse('async_add_task', kwargs={'project_id': self.project.id})),
+            (self.async_client.patch, reverse('async_update_task_description', kwargs={'task_id': self.task.id})),
+        ):
+            for body in ('["New"]', '"New"', '{"description":'):
+                response = await method(url, body, content_type="application/json", headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(await Task.objects.acount(), 1)
+
+    async def test_requires_token_and_ownership(self):
+        url = reverse('async_update_task_status', kwargs={'task_id': self.task.id})
+        self.assertEqual((await self.async_client.patch(url)).status_code, 401)
+        other = await User.objects.acreate(username="Other", email="other@example.com")
+        token = await Token.objects.acreate(user=other)
+        response = await self.async_client.patch(url, headers={"Authorization": f"Token {token.key}"})
+        self.assertEqual(response.status_code, 403)
+
+    async def test_interleaved_toggles_keep_counts(self):
+        # Both UPDATEs land before either toggle reads its task back.
+        barrier = asyncio.Barrier(2)
+        aupdate = QuerySet.aupdate
+
+        async def interleaved_aupdate(queryset, **kwargs):
+            updated = await aupdate(queryset, **kwargs)
+            await barrier.wait()
+            return updated
+
+        url = reverse('async_update_task_status', kwargs={'task_id': self.task.id})
+        with mock.patch.object(QuerySet, "aupdate", interleaved_aupdate):
+            responses = await asyncio.gather(
+                self.async_client.patch(url, headers=self.headers), self.async_client.patch(url, headers=self.headers)
+            )
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+        counts = await Project.objects.filter(id=self.project.id).values_list("task_count", "done_count").aget()
+        self.assertEqual(counts, (1, 0))
@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from api.authentication import token_cache
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        caches['auth'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="AuthUser", email="auth@example.com", password="authpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse('get_pac')
+
+    def test_second_request_skips_token_lookup(self):
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(self.url)
+        self.token.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_in_another_process_is_seen(self):
+        self.client.get(self.url)
+        key = self.token.key
+        # Another process's handlers bump the shared generation but cannot
+        # touch this process's entries.
+        with mock.patch.object(token_cache, "discard"), mock.patch.object(token_cache, "discard_user"):
+            self.token.delete()
+        self.assertIsNotNone(token_cache.get(key))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_in_another_process_is_seen(self):
+        self.client.get(self.url)
+        with mock.patch.object(token_cache, "discard_user"):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_during_lookup_is_not_cached(self):
+        lookup = TokenAuthentication.authenticate_credentials
+
+        def revoked_meanwhile(auth, key):
+            credentials = lookup(auth, key)
+            with mock.patch.object(token_cache, "discard"):
+                Token.objects.filter(key=key).delete()
+            return credentials
+
+        with mock.patch.object(TokenAuthentication, "authenticate_credentials", revoked_meanwhile):
+            self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_CACHE_MAX_SIZE=1)
+    def test_cache_is_bounded(self):
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        other_token = Token.objects.create(user=other)
+        self.client.get(self.url)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {other_token.key}")
+        self.client.get(self.url)
+        self.assertEqual(len(token_cache), 1)
+        self.assertIsNone(token_cache.get(self.token.key))
@@ -0,0 +1,91 @@
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from datetime import datetime
+
+class BatchTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="BatchUser", email="batch@example.com", password="batchpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('batch')
+
+    def batch(self, requests):
+        return self.client.post(self.url, {"requests": requests}, format='json')
+
+    def test_later_requests_use_ids_created_earlier(self):
+        response = self.batch([
+            {"method": "POST", "path": "/api/create_project/", "body": {"title": "Batched"}},
+            {"method": "POST", "path": "/api/projects/$0.id/add_task/", "body": {"description": "First"}},
+            {"method": "PATCH", "path": "/api/tasks/$1.id/update_status/"},
+            {"method": "GET", "path": "/api/projects/$0.id/"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['committed'])
+        self.assertEqual(
+            [result['status'] for result in response.data['responses']], [201, 201, 200, 200]
+        )
+        project = Project.objects.get(title="Batched")
+        self.assertEqual(response.data['responses'][0]['body']['id'], project.id)
+        self.assertEqual(Task.objects.get(report=project).status, "done")
+        self.assertEqual(response.data['responses'][3]['body']['tasks'][0]['description'], "First")
+
+    def test_failed_request_rolls_back_the_batch(self):
+        response = self.batch([
+            {"method": "POST", "path": "/api/create_project/", "body": {"title": "Rolled back"}},
+            {"method": "POST", "path": "/api/projects/$0.id/add_task/", "body": {"description": ""}},
+            {"method": "GET", "path": "/api/projects/"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['committed'])
+        self.assertEqual(len(response.data['responses']), 2)
+        self.assertFalse(Project.objects.filter(title="Rolled back").exists())
+
+    def test_rolled_back_writes_do_not_reach_the_response_cache(self):
+        caches['api'].clear()
+        project = Project.objects.create(title="Cached", created_by=self.user, created_date=datetime.now())
+        response = self.batch([
+            {"method": "POST", "path": f"/api/projects/{project.id}/add_task/", "body": {"description": "Phantom"}},
+            {"method": "GET", "path": f"/api/projects/{project.id}/"},
+            {"method": "GET", "path": "/api/projects/"},
+            {"method": "GET", "path": "/api/projects/0/"},
+        ])
+        self.assertFalse(response.data['committed'])
+        self.assertEqual(len(response.data['responses'][1]['body']['tasks']), 1)
+        response = self.client.get(reverse('project_detail', kwargs={'project_id': project.id}))
+        self.assertEqual(response.data['tasks'], [])
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.data[0]['task_count'], 0)
+
+    def test_sub_requests_cannot_reach_other_users_projects(self):
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        project = Project.objects.create(title="Private", created_by=other, created_date=datetime.now())
+        response = self.batch([{"method": "GET", "path": f"/api/projects/{project.id}/"}])
+        self.assertGreaterEqual(response.status_code, 400)
+        self.assertNotIn('tasks', response.data['responses'][0]['body'])
+
+    def test_invalid_batches_are_rejected(self):
+        for requests, index in (
+            ([], None),
+            ([{"method": "GET", "path": "/api/projects/$0.id/"}], 0),
+            ([{"method": "GET", "path": "/api/projects/"}, {"method": "GET", "path": "/api/projects/$0.missing/"}], 1),
+            ([{"method": "GET", "path": "/api/nowhere/"}], 0),
+            ([{"method": "POST", "path": "/api/batch/"}], 0),
+            ([{"method": "POST", "path": "/api/signin/"}], 0),
+            ([{"method": "GET", "path": "/api/projects/"}, {"method": "GET", "path": "/api/projects/export.zip"}], 1),
+            ([{"method": "TRACE", "path": "/api/projects/"}], 0),
+        ):
+            with self.subTest(requests=requests):
+                response = self.batch(requests)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data['index'], index)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.batch([{"method": "GET", "path": "/api/projects/"}])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,27 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from api import urls
+from api.management.commands.benchmark_routes import SCENARIOS, SKIPPED
+from api.models import Project, Task
+
+class SeedDataTests(TestCase):
+    def test_seed_data_bulk_inserts_users_projects_and_tasks(self):
+        out = StringIO()
+        call_command('seed_data', '--users', '2', '--projects', '3', '--tasks', '10', '--password', 'pw', '--tokens', stdout=out)
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Project.objects.count(), 6)
+        self.assertEqual(Task.objects.count(), 60)
+        self.assertEqual(Token.objects.count(), 2)
+        self.assertTrue(User.objects.first().check_password('pw'))
+        project = Project.objects.first()
+        self.assertEqual((project.task_count, project.deleted_count), (9, 1))
+        self.assertIn("Seeded 2 users, 6 projects and 60 tasks", out.getvalue())
+
+class BenchmarkRoutesTests(TestCase):
+    def test_every_route_has_a_scenario(self):
+        routes = {pattern.name for pattern in urls.urlpatterns}
+        self.assertEqual(routes - set(SKIPPED), set(SCENARIOS))
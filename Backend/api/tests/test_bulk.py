@@ -0,0 +1,65 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from datetime import datetime
+
+class BulkTaskTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="BulkUser", email="bulk@example.com", password="bulkpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Bulk Project", created_by=self.user, created_date=datetime.now()
+        )
+        self.bulk_url = reverse('bulk_tasks', kwargs={'project_id': self.project.id})
+
+    def create_tasks(self, count):
+        response = self.client.post(
+            self.bulk_url, {"action": "create", "descriptions": [f"Task {i}" for i in range(count)]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return [task['id'] for task in response.data['tasks']]
+
+    def test_bulk_create(self):
+        ids = self.create_tasks(1500)
+        self.assertEqual(len(set(ids)), 1500)
+        self.assertEqual(Task.objects.filter(report=self.project).count(), 1500)
+
+    def test_mark_all_done_then_empty_trash(self):
+        ids = self.create_tasks(10)
+        response = self.client.post(self.bulk_url, {"action": "mark_done", "filter": {"isDeleted": False}}, format='json')
+        self.assertEqual(response.data['count'], 10)
+        self.client.post(self.bulk_url, {"action": "delete", "ids": ids[:4]}, format='json')
+        response = self.client.post(self.bulk_url, {"action": "hard_delete", "filter": {"isDeleted": True}}, format='json')
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(Task.objects.filter(report=self.project, status="done").count(), 6)
+
+    def test_ids_are_scoped_to_project(self):
+        other_project = Project.objects.create(title="Other", created_by=self.user, created_date=datetime.now())
+        task = Task.objects.create(
+            report=other_project, description="Elsewhere", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        response = self.client.post(self.bulk_url, {"action": "delete", "ids": [task.id]}, format='json')
+        self.assertEqual(response.data['count'], 0)
+        task.refresh_from_db()
+        self.assertFalse(task.isDeleted)
+
+    def test_invalid_requests(self):
+        for data in [
+            {"action": "explode", "ids": [1]},
+            {"action": "delete", "ids": [True]},
+            {"action": "delete", "ids": ["1"]},
+            {"action": "delete"},
+            {"action": "delete", "filter": {"description": "x"}},
+            {"action": "delete", "filter": {"status": "archived"}},
+            {"action": "delete", "filter": {"status": ["done"]}},
+            {"action": "delete", "filter": {"isDeleted": "no"}},
+            {"action": "delete", "filter": {"isDeleted": 0}},
+            {"action": "create", "descriptions": ["ok", ""]},
+        ]:
+            response = self.client.post(self.bulk_url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,98 @@
+import tempfile
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api import views
+from api.cache import cache_stats, invalidate_project, reset_cache_stats
+from api.models import Project, Task
+from datetime import datetime
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        caches['api'].clear()
+        reset_cache_stats()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="CacheUser", email="cache@example.com", password="cachepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Cache Project", created_by=self.user, created_date=datetime.now(), task_count=1
+        )
+        self.task = Task.objects.create(
+            report=self.project, description="Task", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.detail_url = reverse('project_detail', kwargs={'project_id': self.project.id})
+        self.list_url = reverse('project-list')
+
+    def test_detail_served_from_cache(self):
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], "Cache Project")
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_task_write_invalidates_detail_and_list(self):
+        # The list carries per-project task counts, so task writes reach it too.
+        self.client.get(self.detail_url)
+        self.client.get(self.list_url)
+        self.client.post(reverse('add_task', kwargs={'project_id': self.project.id}), {"description": "New"}, format='json')
+        response = self.client.get(self.detail_url)
+        self.assertEqual(len(response.data['tasks']), 2)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data[0]['task_count'], 2)
+        with self.assertNumQueries(0):
+            self.client.get(self.list_url)
+
+    def test_write_during_miss_is_not_cached_as_fresh(self):
+        # A write that lands while a miss is being read from the database
+        # leaves that response under the old generation.
+        validators = views.project_validators
+
+        def racing_validators(request, project):
+            invalidate_project(project.id)
+            return validators(request, project)
+
+        with mock.patch.object(views, "project_validators", racing_validators):
+            self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.assertEqual(cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_invalidation_is_repeated_on_commit(self):
+        # Responses cached while the writing transaction is still open are
+        # dropped once it commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                invalidate_project(self.project.id)
+                self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.assertEqual(cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_project_write_invalidates_list(self):
+        self.client.get(self.list_url)
+        self.client.delete(reverse('project_delete', kwargs={'project_id': self.project.id}))
+        response = self.client.get(self.list_url)
+        self.assertTrue(response.data[0]['isDeleted'])
+
+    def test_cache_is_per_user(self):
+        self.client.get(self.detail_url)
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        self.client.force_authenticate(user=other)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+            with override_settings(CACHES={'default': backend, 'api': backend}):
+                self.client.get(self.detail_url)
+                with self.assertNumQueries(0):
+                    response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['tasks'][0]['description'], "Task")
@@ -0,0 +1,61 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from api.search import search
+from datetime import datetime
+
+class CloneProjectTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="CloneUser", email="clone@example.com", password="clonepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Sprint template", created_by=self.user, created_date=datetime.now()
+        )
+        Task.objects.bulk_create([
+            Task(
+                report=self.project, description=f"Step {i}", status="done" if i % 2 else "not_done",
+                created_date=datetime.now(), last_updated_on=datetime.now(), isDeleted=i == 4,
+            )
+            for i in range(5)
+        ])
+        Project.bump_version(self.project.id)
+        self.clone_url = reverse('clone_project', kwargs={'project_id': self.project.id})
+
+    def clone(self, **options):
+        response = self.client.post(self.clone_url, options, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Project.objects.get(id=response.data['id']), response
+
+    def test_clone_copies_live_tasks_in_order(self):
+        clone, response = self.clone()
+        self.assertEqual(clone.title, "Sprint template (copy)")
+        self.assertEqual(response.data['copied_tasks'], 4)
+        self.assertEqual((clone.task_count, clone.done_count, clone.deleted_count), (4, 2, 0))
+        self.assertEqual(
+            list(Task.objects.filter(report=clone).order_by('rank', 'id').values_list('description', 'status')),
+            list(Task.objects.filter(report=self.project, isDeleted=False).order_by('rank', 'id')
+                 .values_list('description', 'status')),
+        )
+        # The search index picks the copies up through its triggers.
+        self.assertEqual(len(search(self.user, "Step 1", 10)['tasks']), 2)
+
+    def test_clone_options(self):
+        clone, response = self.clone(title="Sprint 12", reset_status=True, include_deleted=True)
+        self.assertEqual(clone.title, "Sprint 12")
+        self.assertEqual((clone.task_count, clone.done_count, clone.deleted_count), (4, 0, 1))
+        self.assertFalse(Task.objects.filter(report=clone, status="done").exists())
+
+    def test_invalid_options_and_other_users(self):
+        response = self.client.post(self.clone_url, {"reset_status": "yes"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        stranger = User.objects.create_user(username="Stranger", email="stranger@example.com", password="strangerpassword")
+        self.client.force_authenticate(user=stranger)
+        response = self.client.post(self.clone_url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Project.objects.count(), 1)
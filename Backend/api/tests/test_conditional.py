@@ -0,0 +1,49 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from datetime import datetime
+
+@override_settings(API_RESPONSE_CACHE=None)
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="EtagUser", email="etag@example.com", password="etagpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Etag Project", created_by=self.user, created_date=datetime.now()
+        )
+        self.task = Task.objects.create(
+            report=self.project, description="Task", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.detail_url = reverse('project_detail', kwargs={'project_id': self.project.id})
+        self.list_url = reverse('project-list')
+
+    def test_detail_not_modified_skips_tasks(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_task_write_changes_detail_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.patch(reverse('update_task_status', kwargs={'task_id': self.task.id}))
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_on_title_update(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.patch(
+            reverse('update_project_title', kwargs={'project_id': self.project.id}), {"title": "Renamed"}, format='json'
+        )
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['title'], "Renamed")
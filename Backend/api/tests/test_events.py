@@ -0,0 +1,89 @@
+import asyncio
+import json
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from api.events import broker
+from api.models import Project, Task
+from datetime import datetime
+
+class BrokerTests(TestCase):
+    async def test_publish_fans_out_to_project_subscribers(self):
+        first = broker.subscribe(1)
+        second = broker.subscribe(1)
+        other = broker.subscribe(2)
+        try:
+            broker.publish(1, {"type": "task.updated"})
+            self.assertEqual(await first.get(timeout=1), {"type": "task.updated"})
+            self.assertEqual(await second.get(timeout=1), {"type": "task.updated"})
+            with self.assertRaises(asyncio.TimeoutError):
+                await other.get(timeout=0.05)
+        finally:
+            for subscription in (first, second, other):
+                subscription.close()
+        self.assertEqual(broker.subscriber_count(1), 0)
+
+class TaskEventTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="EventUser", email="event@example.com", password="eventpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Event Project", created_by=self.user, created_date=datetime.now(), task_count=1
+        )
+        self.task = Task.objects.create(
+            report=self.project, description="Task", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.events = []
+
+    def publish_capture(self):
+        original = broker.publish
+        self.addCleanup(setattr, broker, "publish", original)
+        broker.publish = lambda project_id, event: self.events.append(event)
+
+    def test_mutations_publish_on_commit(self):
+        self.publish_capture()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('update_task_status', kwargs={'task_id': self.task.id}))
+            self.client.delete(reverse('delete-actual-task', kwargs={'task_id': self.task.id}))
+        self.assertEqual([event["type"] for event in self.events], ["task.updated", "task.removed"])
+        self.assertEqual(self.events[0]["task"]["status"], "done")
+        self.assertEqual(self.events[1]["task"], {"id": self.task.id})
+
+    def test_stream_requires_token(self):
+        response = self.client.get(reverse('project_events', kwargs={'project_id': self.project.id}))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stream_is_refused_under_wsgi(self):
+        token = Token.objects.create(user=self.user)
+        response = self.client.get(
+            reverse('project_events', kwargs={'project_id': self.project.id}), {"token": token.key}
+        )
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="StreamUser", email="stream@example.com", password="streampassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.project = Project.objects.create(title="Stream", created_by=self.user, created_date=datetime.now())
+
+    async def test_stream_delivers_published_events(self):
+        project = self.project
+        response = await self.async_client.get(
+            reverse('project_events', kwargs={'project_id': project.id}), {"token": self.token.key}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b": connected\n\n")
+        broker.publish(project.id, {"type": "task.created", "project": project.id, "task": {"id": 7}})
+        chunk = (await anext(stream)).decode()
+        await stream.aclose()
+        self.assertTrue(chunk.startswith("event: task.created\n"))
+        self.assertEqual(json.loads(chunk.split("data: ", 1)[1])["task"], {"id": 7})
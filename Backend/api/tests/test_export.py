@@ -0,0 +1,50 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from api.markdown import project_markdown
+from datetime import datetime
+
+class ProjectExportTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="ExportUser", email="export@example.com", password="exportpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Export Project", created_by=self.user, created_date=datetime.now()
+        )
+        for description, task_status in [("Write docs", "done"), ("Ship it", "not_done"), ("Old", "not_done")]:
+            Task.objects.create(
+                report=self.project, description=description, status=task_status,
+                created_date=datetime.now(), last_updated_on=datetime.now(),
+                isDeleted=description == "Old"
+            )
+        # The tasks were inserted directly, so bring the counters up to date as a task write would.
+        Project.bump_version(self.project.id)
+        self.export_url = reverse('project_export', kwargs={'project_id': self.project.id})
+
+    def test_export_streams_markdown(self):
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('Export Project-tasks.md', response['Content-Disposition'])
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn("# Export Project", content)
+        self.assertIn("### Summary : 1/2 Compleated", content)
+        self.assertIn("- [ ] Ship it", content)
+        self.assertIn("- [x] Write docs", content)
+        self.assertNotIn("Old", content)
+        self.assertLess(content.index("- [ ] Ship it"), content.index("## Completed"))
+
+    def test_export_yields_in_chunks(self):
+        chunks = list(project_markdown(self.project, chunk_size=1))
+        self.assertGreater(len(chunks), 3)
+
+    def test_export_other_users_project(self):
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        self.client.force_authenticate(user=other)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
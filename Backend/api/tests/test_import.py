@@ -0,0 +1,77 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from api.markdown import import_checklist, project_markdown
+from datetime import datetime
+
+class ImportChecklistTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="ImportUser", email="import@example.com", password="importpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.import_url = reverse('import_checklist')
+
+    def upload(self, content, **data):
+        if isinstance(content, str):
+            content = content.encode()
+        data["file"] = SimpleUploadedFile("tasks.md", content, content_type="text/markdown")
+        return self.client.post(self.import_url, data, format='multipart')
+
+    def test_export_imports_back(self):
+        project = Project.objects.create(title="Round trip", created_by=self.user, created_date=datetime.now())
+        for description, task_status in [("Write docs", "done"), ("Ship it", "not_done"), ("Celebrate", "not_done")]:
+            Task.objects.create(
+                report=project, description=description, status=task_status,
+                created_date=datetime.now(), last_updated_on=datetime.now(),
+            )
+        Project.bump_version(project.id)
+
+        response = self.upload("".join(project_markdown(Project.objects.get(id=project.id))))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['title'], response.data['imported_tasks']), ("Round trip", 3))
+        imported = Project.objects.get(id=response.data['id'])
+        self.assertEqual((imported.task_count, imported.done_count), (3, 1))
+        self.assertEqual(
+            list(Task.objects.filter(report=imported).order_by('rank', 'id').values_list('description', 'status')),
+            [("Ship it", "not_done"), ("Celebrate", "not_done"), ("Write docs", "done")],
+        )
+
+    def test_import_into_existing_project(self):
+        project = Project.objects.create(title="Existing", created_by=self.user, created_date=datetime.now())
+        Task.objects.create(report=project, description="First", created_date=datetime.now(), last_updated_on=datetime.now())
+        response = self.upload("* [X] Second\n+ [ ] Third\nnot a task\n- [ ] \n", project_id=project.id, title="Ignored")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['imported_tasks'], 2)
+        self.assertEqual(Project.objects.get(id=project.id).title, "Existing")
+        self.assertEqual(
+            list(Task.objects.filter(report=project).order_by('rank', 'id').values_list('description', flat=True)),
+            ["First", "Second", "Third"],
+        )
+
+    def test_tasks_are_inserted_in_batches(self):
+        lines = (f"- [ ] Task {i}\n".encode() for i in range(95))
+        with CaptureQueriesContext(connection) as captured:
+            project, created, imported = import_checklist(lines, self.user, batch_size=10)
+        inserts = [query for query in captured if query['sql'].startswith('INSERT INTO "api_task"')]
+        self.assertEqual((created, imported, len(inserts)), (True, 95, 10))
+        self.assertEqual(project.title, "Imported checklist")
+
+    def test_rejected_imports_write_nothing(self):
+        for content in ("# Just a heading\n\nSome notes.\n", b"- [ ] Fine\n- [ ] \xff\n"):
+            with self.subTest(content=content):
+                self.assertEqual(self.upload(content).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(self.import_url, {}, format='multipart').status_code, 400)
+        self.assertEqual(self.upload("- [ ] Fine\n", title="x" * 256).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Project.objects.exists())
+
+        stranger = User.objects.create_user(username="Stranger", email="stranger@example.com", password="strangerpassword")
+        project = Project.objects.create(title="Private", created_by=stranger, created_date=datetime.now())
+        self.assertEqual(self.upload("- [ ] Sneaky\n", project_id=project.id).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Task.objects.exists())
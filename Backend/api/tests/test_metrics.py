@@ -0,0 +1,69 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from api.metrics import registry
+from api.models import Project, Task
+from datetime import datetime
+
+class MetricsTests(APITestCase):
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="MetricsUser", email="metrics@example.com", password="metricspassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Metrics Project", created_by=self.user, created_date=datetime.now()
+        )
+        Task.objects.create(
+            report=self.project, description="Task", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.detail_url = reverse('project_detail', kwargs={'project_id': self.project.id})
+
+    @override_settings(API_RESPONSE_CACHE=None)
+    def test_server_timing_reports_queries(self):
+        response = self.client.get(self.detail_url)
+        self.assertRegex(response['Server-Timing'], r'^db;desc="2 queries";dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_metrics_endpoint_serves_route_histograms(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        with override_settings(METRICS_TOKEN="scrape-secret"):
+            body = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION="Bearer scrape-secret").content.decode()
+        labels = 'route="api/projects/<int:project_id>/",method="GET"'
+        self.assertIn(f'api_request_duration_seconds_count{{{labels}}} 2', body)
+        self.assertIn(f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', body)
+        self.assertIn(f'api_responses_total{{{labels},status="2xx"}} 2', body)
+        self.assertIn('api_response_cache_requests_total{outcome="hit"}', body)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_metrics_endpoint_requires_token_or_staff(self):
+        url = reverse('metrics')
+        client = APIClient()
+        self.assertEqual(client.get(url).status_code, 401)
+        self.assertEqual(client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+        token = Token.objects.create(user=self.user)
+        self.assertEqual(client.get(url, HTTP_AUTHORIZATION=f"Token {token.key}").status_code, 401)
+        self.assertEqual(client.get(url, HTTP_AUTHORIZATION="Bearer scrape-secret").status_code, 200)
+
+        with override_settings(METRICS_TOKEN=None):
+            self.assertEqual(client.get(url, HTTP_AUTHORIZATION="Bearer None").status_code, 401)
+            client.force_login(self.user)
+            self.assertEqual(client.get(url).status_code, 401)
+            self.user.is_staff = True
+            self.user.save()
+            self.assertEqual(client.get(url).status_code, 200)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_request_log_includes_sql(self):
+        with self.assertLogs('api.slow_requests', level='WARNING') as logs:
+            self.client.get(self.detail_url)
+        self.assertIn("Slow request GET", logs.output[0])
+        self.assertIn('FROM "api_task"', logs.output[0])
+
+    def test_requests_outside_api_are_not_timed(self):
+        response = self.client.get('/admin/login/')
+        self.assertNotIn('Server-Timing', response)
@@ -0,0 +1,58 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from datetime import datetime, timedelta
+
+class PaginationTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="PageUser", email="page@example.com", password="pagepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        now = datetime.now()
+        for i in range(5):
+            Project.objects.create(title=f"Project {i}", created_by=self.user, created_date=now + timedelta(seconds=i))
+        self.project = Project.objects.first()
+        for i in range(5):
+            # Same created_date for every task, so the id tie-breaker is exercised.
+            Task.objects.create(
+                report=self.project, description=f"Task {i}", created_date=now,
+                last_updated_on=now, isDeleted=i == 4
+            )
+        self.list_url = reverse('project-list')
+        self.detail_url = reverse('project_detail', kwargs={'project_id': self.project.id})
+
+    def test_project_list_unpaginated_by_default(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+
+    def test_project_list_walks_all_pages(self):
+        titles = []
+        params = {"page_size": 2}
+        while True:
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles += [project["title"] for project in response.data["results"]]
+            if not response.data["next_cursor"]:
+                break
+            params["cursor"] = response.data["next_cursor"]
+        self.assertEqual(titles, [f"Project {i}" for i in range(5)])
+
+    def test_project_detail_paginates_tasks(self):
+        response = self.client.get(self.detail_url, {"page_size": 3})
+        self.assertEqual([task["description"] for task in response.data["tasks"]], ["Task 0", "Task 1", "Task 2"])
+        self.assertEqual(len(response.data["deleted_task"]), 1)
+        self.assertIsNone(response.data["deleted_next_cursor"])
+
+        response = self.client.get(self.detail_url, {"page_size": 3, "cursor": response.data["next_cursor"]})
+        self.assertEqual([task["description"] for task in response.data["tasks"]], ["Task 3"])
+        self.assertIsNone(response.data["next_cursor"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
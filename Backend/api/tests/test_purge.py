@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, PurgeJob, Task, TaskTombstone
+from api import purge
+from api.purge import claim_job, run_pending_jobs
+
+@override_settings(PURGE_WORKER_IN_PROCESS=False)
+class PurgeTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="PurgeUser", email="purge@example.com", password="purgepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = self.create_project("Purge Project", 5)
+
+    def create_project(self, title, tasks, **fields):
+        project = Project.objects.create(title=title, created_by=self.user, created_date=datetime.now(), **fields)
+        Task.objects.bulk_create([
+            Task(report=project, description=f"Task {i}", created_date=datetime.now(), last_updated_on=datetime.now())
+            for i in range(tasks)
+        ])
+        Project.bump_version(project.id)
+        return project
+
+    def test_hard_delete_is_queued_and_purged_in_chunks(self):
+        response = self.client.delete(reverse('project_actual_delete', kwargs={'project_id': self.project.id}))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual((response.data['status'], response.data['total'], response.data['deleted']), ("queued", 5, 0))
+
+        # Gone from the API straight away, still on disk until the worker runs.
+        self.assertEqual(self.client.get(reverse('project-list')).data, [])
+        detail = self.client.get(reverse('project_detail', kwargs={'project_id': self.project.id}))
+        self.assertEqual(detail.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Task.objects.filter(report_id=self.project.id).count(), 5)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(run_pending_jobs(chunk_size=2), 1)
+        chunk_delete = 'DELETE FROM "api_task" WHERE "api_task"."id" IN'
+        task_deletes = [query for query in captured if query['sql'].startswith(chunk_delete)]
+        self.assertEqual(len(task_deletes), 3)
+        self.assertFalse(Project.all_objects.filter(id=self.project.id).exists())
+        self.assertFalse(Task.objects.filter(report_id=self.project.id).exists())
+
+        response = self.client.get(reverse('purge_job', kwargs={'job_id': response.data['id']}))
+        self.assertEqual((response.data['status'], response.data['total'], response.data['deleted']), ("done", 5, 5))
+
+    def test_purge_job_is_private(self):
+        job = PurgeJob.objects.create(kind="project", requested_by=self.user, project_id=self.project.id)
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse('purge_job', kwargs={'job_id': job.id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_trash_removes_only_expired_items(self):
+        old = timezone.now() - timedelta(days=40)
+        expired, recent, live = Task.objects.filter(report=self.project).order_by('id')[:3]
+        Task.objects.filter(id=expired.id).update(isDeleted=True, last_updated_on=old)
+        Task.objects.filter(id=recent.id).update(isDeleted=True, last_updated_on=timezone.now())
+        trashed = self.create_project("Trashed", 3, isDeleted=True)
+        Project.objects.filter(id=trashed.id).update(last_updated_on=old)
+        Project.bump_version(self.project.id)
+
+        out = StringIO()
+        call_command('purge_trash', '--days', '30', stdout=out)
+        self.assertIn("done: 4/4 tasks deleted", out.getvalue())
+
+        self.assertFalse(Task.objects.filter(id=expired.id).exists())
+        self.assertTrue(Task.objects.filter(id__in=[recent.id, live.id]).count() == 2)
+        self.assertTrue(TaskTombstone.objects.filter(project=self.project, task_id=expired.id).exists())
+        self.assertFalse(Project.all_objects.filter(id=trashed.id).exists())
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.task_count, self.project.deleted_count), (3, 1))
+
+    def test_abandoned_job_is_claimed_again(self):
+        now = timezone.now()
+        abandoned = PurgeJob.objects.create(
+            kind="project", project_id=self.project.id, status="running", started_on=now - timedelta(hours=1),
+            heartbeat_on=now - timedelta(minutes=10),
+        )
+        PurgeJob.objects.create(kind="project", project_id=self.project.id, status="running", heartbeat_on=now)
+        with self.assertLogs("api.purge", "WARNING"):
+            job = claim_job()
+        self.assertEqual(job.id, abandoned.id)
+        self.assertEqual(job.started_on, abandoned.started_on)
+        self.assertIsNone(claim_job())
+
+        purge.run_job(job)
+        self.assertEqual(PurgeJob.objects.get(id=job.id).status, "done")
+        self.assertFalse(Project.all_objects.filter(id=self.project.id).exists())
+
+    def test_worker_resumes_once_per_process(self):
+        with mock.patch.object(purge, "_resumed", False), mock.patch.object(purge, "wake_worker") as wake:
+            # Only requests through the real WSGI and ASGI handlers start it.
+            self.client.get(reverse('project-list'))
+            wake.assert_not_called()
+            purge.resume_worker(sender=WSGIHandler)
+            purge.resume_worker(sender=WSGIHandler)
+        wake.assert_called_once_with()
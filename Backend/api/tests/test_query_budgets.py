@@ -0,0 +1,151 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from api import urls
+from api.models import Project, PurgeJob, Task
+from api.sync import encode_version
+from datetime import datetime
+
+# Exact number of queries each route may run, whatever the size of the
+# project it touches. Transaction savepoints are not counted.
+QUERY_BUDGETS = {
+    "signup": 3,  # email and username checks, INSERT
+    "signin": 2,  # user, token
+    "profile_api": 1,
+    "get_pac": 1,
+    "create_project": 1,
+    "project-list": 2,  # ETag aggregate, projects
+    "projects_archive": 3,  # projects, pending tasks, completed tasks, however many projects
+    "import_checklist": 3,  # project INSERT, one bulk INSERT per 1000 tasks, version and counters UPDATE
+    "update_project_title": 2,  # project, UPDATE
+    "clone_project": 4,  # project, project INSERT, INSERT ... SELECT of tasks, counters UPDATE
+    "project_detail": 2,  # project, tasks
+    "project_export": 3,  # project, pending tasks, completed tasks
+    "project_changes": 3,  # project, changed tasks, tombstones
+    "add_task": 3,  # project, INSERT, version and counters UPDATE
+    "bulk_tasks": 3,  # project, UPDATE, version and counters UPDATE
+    "project_delete": 2,
+    "project_restore": 2,
+    "project_actual_delete": 3,  # project, UPDATE, purge job INSERT
+    "metrics": 0,
+    "purge_job": 1,
+    "search": 2,  # tasks, projects
+    "batch": 4,  # create_project, then add_task on it
+    "delete-task": 3,  # owner-scoped UPDATE, read back, version and counters UPDATE
+    "restore-task": 3,
+    "update_task_status": 3,
+    "update_task_description": 3,
+    "move_task": 4,  # task and neighbours, owner-scoped UPDATE, read back, version and counters UPDATE
+    "delete-actual-task": 4,  # task with project, tombstone INSERT, DELETE, version and counters UPDATE
+}
+
+# Routes that cannot be measured as one request/response.
+UNBUDGETED = {"project_events"}
+
+# Routes that take a file upload instead of JSON.
+MULTIPART_ROUTES = {"import_checklist"}
+
+PROJECT_SIZES = (1, 10, 200)
+
+@override_settings(
+    API_RESPONSE_CACHE=None, PURGE_WORKER_IN_PROCESS=False, METRICS_TOKEN="budget-metrics",
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class QueryBudgetTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="BudgetUser", email="budget@example.com", password="budgetpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        # Only the metrics view reads it; DRF views take the forced user.
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer budget-metrics")
+        Token.objects.create(user=self.user)
+
+    def create_project(self, size):
+        project = Project.objects.create(title="Budget Project", created_by=self.user, created_date=datetime.now())
+        Task.objects.bulk_create([
+            Task(
+                report=project, description=f"Budget task {i}", status="done" if i % 2 else "not_done",
+                created_date=datetime.now(), last_updated_on=datetime.now(), isDeleted=i % 5 == 4,
+            )
+            for i in range(size)
+        ])
+        Project.bump_version(project.id)
+        return project, Task.objects.filter(report=project).order_by('id').first()
+
+    def build_request(self, route, project, task, serial):
+        project_url = {'project_id': project.id}
+        task_url = {'task_id': task.id}
+        requests = {
+            "signup": ("post", reverse('signup'), {
+                "first_name": f"budget{serial}", "email": f"budget{serial}@example.com",
+                "password": "pw", "confirm_password": "pw",
+            }),
+            "signin": ("post", reverse('signin'), {"email": "budget@example.com", "password": "budgetpassword"}),
+            "profile_api": ("get", reverse('profile_api'), None),
+            "get_pac": ("get", reverse('get_pac'), None),
+            "create_project": ("post", reverse('create_project'), {"title": "New"}),
+            "project-list": ("get", reverse('project-list'), None),
+            "projects_archive": ("get", reverse('projects_archive'), None),
+            "import_checklist": ("post", reverse('import_checklist'), {
+                "file": SimpleUploadedFile("tasks.md", b"# Imported\n\n- [ ] One \n\n- [x] Two \n"),
+            }),
+            "update_project_title": ("patch", reverse('update_project_title', kwargs=project_url), {"title": "Renamed"}),
+            "clone_project": ("post", reverse('clone_project', kwargs=project_url), {"reset_status": True}),
+            "project_detail": ("get", reverse('project_detail', kwargs=project_url), None),
+            "project_export": ("get", reverse('project_export', kwargs=project_url), None),
+            "project_changes": (
+                "get", reverse('project_changes', kwargs=project_url) + "?since=" + encode_version(0), None
+            ),
+            "add_task": ("post", reverse('add_task', kwargs=project_url), {"description": "New"}),
+            "bulk_tasks": (
+                "post", reverse('bulk_tasks', kwargs=project_url), {"action": "mark_done", "filter": {"isDeleted": False}}
+            ),
+            "project_delete": ("delete", reverse('project_delete', kwargs=project_url), None),
+            "project_restore": ("delete", reverse('project_restore', kwargs=project_url), None),
+            "project_actual_delete": ("delete", reverse('project_actual_delete', kwargs=project_url), None),
+            "metrics": ("get", reverse('metrics'), None),
+            "purge_job": ("get", reverse('purge_job', kwargs={'job_id': self.purge_job.id}), None),
+            "search": ("get", reverse('search') + "?q=budget", None),
+            "batch": ("post", reverse('batch'), {"requests": [
+                {"method": "POST", "path": reverse('create_project'), "body": {"title": "Batched"}},
+                {"method": "POST", "path": "/api/projects/$0.id/add_task/", "body": {"description": "New"}},
+            ]}),
+            "delete-task": ("delete", reverse('delete-task', kwargs=task_url), None),
+            "restore-task": ("delete", reverse('restore-task', kwargs=task_url), None),
+            "update_task_status": ("patch", reverse('update_task_status', kwargs=task_url), None),
+            "update_task_description": (
+                "patch", reverse('update_task_description', kwargs=task_url), {"description": "Edited"}
+            ),
+            "move_task": ("patch", reverse('move_task', kwargs=task_url), {"after": None, "before": None}),
+            "delete-actual-task": ("delete", reverse('delete-actual-task', kwargs=task_url), None),
+        }
+        return requests[route]
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual({pattern.name for pattern in urls.urlpatterns} - UNBUDGETED, set(QUERY_BUDGETS))
+
+    def test_query_counts_do_not_grow_with_project_size(self):
+        self.purge_job = PurgeJob.objects.create(kind="project", requested_by=self.user)
+        serial = 0
+        for size in PROJECT_SIZES:
+            for route, budget in QUERY_BUDGETS.items():
+                serial += 1
+                with self.subTest(route=route, tasks=size):
+                    project, task = self.create_project(size)
+                    method, url, data = self.build_request(route, project, task, serial)
+                    with CaptureQueriesContext(connection) as captured:
+                        response = getattr(self.client, method)(
+                            url, data, format='multipart' if route in MULTIPART_ROUTES else 'json'
+                        )
+                        if response.streaming:
+                            b"".join(response.streaming_content)
+                    queries = [query['sql'] for query in captured if 'SAVEPOINT' not in query['sql']]
+                    self.assertLess(response.status_code, 400)
+                    self.assertEqual(len(queries), budget, "\n".join(queries))
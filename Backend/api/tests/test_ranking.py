@@ -0,0 +1,128 @@
+import random
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from api.ranking import RANK_REBALANCE_LENGTH, next_rank, rank_between
+from api.rebalance import rebalance_project
+
+class RankBetweenTests(SimpleTestCase):
+    def test_random_inserts_keep_order(self):
+        rng = random.Random(0)
+        ranks = [next_rank() for _ in range(3)]
+        for _ in range(2000):
+            i = rng.randrange(len(ranks) + 1)
+            before = ranks[i - 1] if i else None
+            after = ranks[i] if i < len(ranks) else None
+            ranks.insert(i, rank_between(before, after))
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), len(ranks))
+
+    def test_new_ranks_sort_after_moved_ones(self):
+        for before in (None, next_rank()):
+            moved = rank_between(before, None)
+            self.assertLess(moved, next_rank())
+
+    def test_rejects_neighbours_out_of_order(self):
+        first, second = next_rank(), next_rank()
+        with self.assertRaises(ValueError):
+            rank_between(second, first)
+
+
+@override_settings(RANK_REBALANCE_IN_PROCESS=False)
+class MoveTaskTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="RankUser", email="rank@example.com", password="rankpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(title="Rank Project", created_by=self.user, created_date=datetime.now())
+        self.ids = [task.id for task in Task.objects.bulk_create([
+            Task(report=self.project, description=f"Task {i}", created_date=datetime.now(), last_updated_on=datetime.now())
+            for i in range(5)
+        ])]
+        Project.bump_version(self.project.id)
+
+    def move(self, task_id, after=None, before=None):
+        return self.client.patch(reverse('move_task', kwargs={'task_id': task_id}), {"after": after, "before": before}, format='json')
+
+    def order(self):
+        response = self.client.get(reverse('project_detail', kwargs={'project_id': self.project.id}))
+        return [task['id'] for task in response.data['tasks']]
+
+    def test_tasks_are_listed_in_creation_order(self):
+        self.assertEqual(self.order(), self.ids)
+
+    def test_move_rewrites_one_row(self):
+        a, b, c, d, e = self.ids
+        with CaptureQueriesContext(connection) as captured:
+            response = self.move(e, after=a, before=b)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        writes = [query['sql'] for query in captured if query['sql'].startswith('UPDATE "api_task"')]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(self.order(), [a, e, b, c, d])
+
+        self.assertEqual(self.move(a, before=None, after=d).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.move(c, after=None, before=e).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.order(), [c, e, b, d, a])
+
+    def test_export_and_pages_follow_rank_order(self):
+        a, b, c, d, e = self.ids
+        self.move(d, before=a)
+        response = self.client.get(reverse('project_export', kwargs={'project_id': self.project.id}))
+        content = b"".join(response.streaming_content).decode()
+        self.assertLess(content.index("Task 3"), content.index("Task 0"))
+
+        url = reverse('project_detail', kwargs={'project_id': self.project.id})
+        response = self.client.get(url, {"page_size": 3})
+        ids = [task['id'] for task in response.data['tasks']]
+        response = self.client.get(url, {"page_size": 3, "cursor": response.data['next_cursor']})
+        ids += [task['id'] for task in response.data['tasks']]
+        self.assertEqual(ids, [d, a, b, c, e])
+
+    def test_invalid_moves(self):
+        a, b, c, d, e = self.ids
+        other = Project.objects.create(title="Other", created_by=self.user, created_date=datetime.now())
+        elsewhere = Task.objects.create(
+            report=other, description="Elsewhere", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.assertEqual(self.move(a, after=elsewhere.id).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.move(a, after=a).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.move(a, after="b").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.move(a, after=d, before=b).status_code, status.HTTP_409_CONFLICT)
+
+        stranger = User.objects.create_user(username="Stranger", email="stranger@example.com", password="strangerpassword")
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(self.move(a, before=b).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_long_ranks_are_rebalanced_in_order(self):
+        a, b = self.ids[:2]
+        for task_id in self.ids[2:] * 50:
+            self.assertEqual(self.move(task_id, after=a, before=b).status_code, status.HTTP_200_OK)
+            b = task_id
+        order = self.order()
+        self.assertGreater(max(len(rank) for rank in Task.objects.values_list("rank", flat=True)), RANK_REBALANCE_LENGTH)
+
+        out = StringIO()
+        call_command("rebalance_task_ranks", stdout=out)
+        self.assertIn("Rebalanced 1 projects.", out.getvalue())
+        self.assertEqual(self.order(), order)
+        self.assertLessEqual(max(len(rank) for rank in Task.objects.values_list("rank", flat=True)), 11)
+
+    def test_tied_ranks_are_rebalanced(self):
+        a, b = self.ids[:2]
+        Task.objects.filter(id=b).update(rank=Task.objects.get(id=a).rank)
+        self.assertEqual(self.move(self.ids[4], after=a, before=b).status_code, status.HTTP_409_CONFLICT)
+        touched = dict(Task.objects.values_list("id", "last_updated_on"))
+        self.assertEqual(rebalance_project(self.project.id), 5)
+        self.assertEqual(dict(Task.objects.values_list("id", "last_updated_on")), touched)
+        self.assertEqual(self.move(self.ids[4], after=a, before=b).status_code, status.HTTP_200_OK)
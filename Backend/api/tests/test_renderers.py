@@ -0,0 +1,51 @@
+import io
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api import renderers
+from api.models import Project
+
+class FastJSONTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="JsonUser", email="json@example.com", password="jsonpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_matches_drf_encoder(self):
+        data = {
+            "aware": datetime(2024, 1, 2, 3, 4, 5, 120, tzinfo=dt_timezone.utc),
+            "naive": datetime(2024, 1, 2, 3, 4, 5),
+            "decimal": Decimal("1.50"),
+            "error": ErrorDetail("Not found.", code="not_found"),
+            "text": "é ☃",
+            "list": [1, 2.5, None, True],
+        }
+        self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_to_stdlib_without_orjson(self):
+        data = {"created": datetime(2024, 1, 2, tzinfo=dt_timezone.utc)}
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+            self.assertEqual(renderers.FastJSONParser().parse(io.BytesIO(b'{"a": 1}')), {"a": 1})
+
+    def test_invalid_json_is_a_bad_request(self):
+        with self.assertRaises(ParseError):
+            renderers.FastJSONParser().parse(io.BytesIO(b"{"))
+        project = Project.objects.create(title="Json", created_by=self.user, created_date=datetime.now())
+        response = self.client.post(
+            reverse('add_task', kwargs={'project_id': project.id}), "{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_browsable_api_is_off(self):
+        response = self.client.get(reverse('project-list'), HTTP_ACCEPT="text/html,*/*;q=0.8")
+        self.assertEqual(response['Content-Type'], "application/json")
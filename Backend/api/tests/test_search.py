@@ -0,0 +1,65 @@
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from api.search import fts_query, naive_search
+from datetime import datetime
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="SearchUser", email="search@example.com", password="searchpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Release planning", created_by=self.user, created_date=datetime.now(), task_count=1
+        )
+        self.task = Task.objects.create(
+            report=self.project, description="Write release notes", created_date=datetime.now(),
+            last_updated_on=datetime.now()
+        )
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        other_project = Project.objects.create(title="Other release", created_by=other, created_date=datetime.now())
+        Task.objects.create(
+            report=other_project, description="Other release notes", created_date=datetime.now(),
+            last_updated_on=datetime.now()
+        )
+        self.search_url = reverse('search')
+
+    def test_prefix_search_scoped_to_user(self):
+        response = self.client.get(self.search_url, {"q": "relea"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['tasks']], [self.task.id])
+        self.assertEqual([project['id'] for project in response.data['projects']], [self.project.id])
+        self.assertEqual(response.data['tasks'][0]['project_title'], "Release planning")
+
+    def test_index_follows_updates_and_deletes(self):
+        self.client.patch(
+            reverse('update_task_description', kwargs={'task_id': self.task.id}), {"description": "Ship binaries"},
+            format='json'
+        )
+        self.assertEqual(self.client.get(self.search_url, {"q": "notes"}).data['tasks'], [])
+        self.assertEqual(len(self.client.get(self.search_url, {"q": "binar"}).data['tasks']), 1)
+        self.client.delete(reverse('delete-actual-task', kwargs={'task_id': self.task.id}))
+        self.assertEqual(self.client.get(self.search_url, {"q": "binar"}).data['tasks'], [])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(fts_query('notes" OR *', "description"), 'description : ("notes"* "OR"*)')
+        response = self.client.get(self.search_url, {"q": 'release" AND ('})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_naive_search_matches(self):
+        self.assertEqual([task['id'] for task in naive_search(self.user, "release")['tasks']], [self.task.id])
+
+    def test_projects_queued_for_purge_are_hidden(self):
+        Project.objects.filter(id=self.project.id).update(purge_requested_on=timezone.now())
+        response = self.client.get(self.search_url, {"q": "relea"})
+        self.assertEqual(response.data['tasks'], [])
+        self.assertEqual(response.data['projects'], [])
+        self.assertEqual(naive_search(self.user, "release"), {"tasks": [], "projects": []})
+
+    def test_missing_query(self):
+        self.assertEqual(self.client.get(self.search_url).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from api.models import Project, Task
+from api.sync import encode_since, encode_version
+
+class ProjectChangesTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="SyncUser", email="sync@example.com", password="syncpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        old = timezone.now() - timedelta(hours=1)
+        self.project = Project.objects.create(title="Sync Project", created_by=self.user, created_date=old, task_count=3)
+        self.kept = Task.objects.create(report=self.project, description="Kept", created_date=old, last_updated_on=old)
+        self.toggled = Task.objects.create(report=self.project, description="Toggled", created_date=old, last_updated_on=old)
+        self.removed = Task.objects.create(report=self.project, description="Removed", created_date=old, last_updated_on=old)
+        self.since = encode_version(0)
+        self.changes_url = reverse('project_changes', kwargs={'project_id': self.project.id})
+
+    def test_baseline_returns_everything(self):
+        response = self.client.get(self.changes_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['tasks']), 3)
+        self.assertEqual(response.data['project']['title'], "Sync Project")
+        self.assertTrue(response.data['cursor'])
+
+    def test_only_changes_since_cursor(self):
+        self.client.patch(reverse('update_task_status', kwargs={'task_id': self.toggled.id}))
+        self.client.delete(reverse('delete-actual-task', kwargs={'task_id': self.removed.id}))
+        add = self.client.post(reverse('add_task', kwargs={'project_id': self.project.id}), {"description": "New"}, format='json')
+
+        response = self.client.get(self.changes_url, {"since": self.since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({task['id'] for task in response.data['tasks']}, {self.toggled.id, add.data['id']})
+        self.assertEqual(response.data['removed'], [self.removed.id])
+
+    def test_no_changes(self):
+        response = self.client.get(self.changes_url, {"since": self.since})
+        self.assertEqual(response.data['tasks'], [])
+        self.assertEqual(response.data['removed'], [])
+        self.assertIsNone(response.data['project'])
+
+    def test_soft_delete_shows_up_as_change(self):
+        self.client.delete(reverse('delete-task', kwargs={'task_id': self.kept.id}))
+        response = self.client.get(self.changes_url, {"since": self.since})
+        self.assertEqual(len(response.data['tasks']), 1)
+        self.assertTrue(response.data['tasks'][0]['isDeleted'])
+
+    def test_invalid_since(self):
+        for since in ("%%%", encode_since(timezone.now()), encode_version(-1)):
+            response = self.client.get(self.changes_url, {"since": since})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_covers_writes_stamped_before_it(self):
+        cursor = self.client.get(self.changes_url).data['cursor']
+        # A write whose timestamp was taken long before it committed.
+        Task.objects.filter(id=self.kept.id).update(
+            description="Late", last_updated_on=timezone.now() - timedelta(minutes=5),
+            version=Project.next_version(self.project.id),
+        )
+        Project.bump_version(self.project.id, {})
+        response = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual([task['description'] for task in response.data['tasks']], ["Late"])
+        response = self.client.get(self.changes_url, {"since": response.data['cursor']})
+        self.assertEqual(response.data['tasks'], [])
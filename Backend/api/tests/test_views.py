@@ -1,3 +1,8 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
@@ -94,3 +99,162 @@ class TaskTests(APITestCase):
         response = self.client.post(self.add_task_url, {}, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
+
+class ProjectDetailTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="DetailUser", email="detail@example.com", password="detailpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Detail Project", created_by=self.user, created_date=datetime.now()
+        )
+        for i in range(4):
+            Task.objects.create(
+                report=self.project, description=f"Task {i}", created_date=datetime.now(),
+                last_updated_on=datetime.now(), isDeleted=i == 3
+            )
+        self.detail_url = reverse('project_detail', kwargs={'project_id': self.project.id})
+
+    def test_project_detail_splits_deleted_tasks(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['tasks']), 3)
+        self.assertEqual([task['description'] for task in response.data['deleted_task']], ["Task 3"])
+        self.assertEqual(
+            set(response.data['tasks'][0]),
+            {"id", "description", "status", "created_date", "last_updated_on", "rank"}
+        )
+
+class TaskMutationTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="MutateUser", email="mutate@example.com", password="mutatepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Mutate Project", created_by=self.user, created_date=datetime.now(), task_count=1
+        )
+        self.task = Task.objects.create(
+            report=self.project, description="Task", created_date=datetime.now(), last_updated_on=datetime.now()
+        )
+        self.status_url = reverse('update_task_status', kwargs={'task_id': self.task.id})
+
+    def test_toggle_status_in_one_update(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.patch(self.status_url)
+        statements = [query['sql'].split()[0] for query in captured if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(statements, ["UPDATE", "SELECT", "UPDATE"])
+        self.assertEqual(response.data['status'], "done")
+        response = self.client.patch(self.status_url)
+        self.assertEqual(response.data['status'], "not_done")
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "not_done")
+
+    def test_mutations_on_other_users_task(self):
+        other = User.objects.create_user(username="Other", email="other@example.com", password="otherpassword")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.patch(self.status_url).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.delete(reverse('delete-task', kwargs={'task_id': self.task.id}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "not_done")
+        self.assertFalse(self.task.isDeleted)
+
+    def test_mutations_on_missing_task(self):
+        response = self.client.patch(
+            reverse('update_task_description', kwargs={'task_id': self.task.id + 1}), {"description": "x"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_restore_and_describe(self):
+        self.client.delete(reverse('delete-task', kwargs={'task_id': self.task.id}))
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.isDeleted)
+        self.client.delete(reverse('restore-task', kwargs={'task_id': self.task.id}))
+        response = self.client.patch(
+            reverse('update_task_description', kwargs={'task_id': self.task.id}), {"description": "Renamed"}, format='json'
+        )
+        self.assertEqual(response.data['description'], "Renamed")
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.isDeleted)
+
+class ProjectCountTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="CountUser", email="count@example.com", password="countpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(
+            title="Count Project", created_by=self.user, created_date=datetime.now()
+        )
+        self.list_url = reverse('project-list')
+
+    def counts(self):
+        response = self.client.get(self.list_url)
+        project = response.data[0]
+        return project['task_count'], project['done_count'], project['deleted_count']
+
+    def test_task_writes_update_listed_counts(self):
+        self.assertEqual(self.counts(), (0, 0, 0))
+        for description in ("a", "b", "c"):
+            self.client.post(reverse('add_task', kwargs={'project_id': self.project.id}), {"description": description})
+        self.assertEqual(self.counts(), (3, 0, 0))
+
+        first, second, third = Task.objects.filter(report=self.project).order_by('id')
+        self.client.patch(reverse('update_task_status', kwargs={'task_id': first.id}))
+        self.client.delete(reverse('delete-task', kwargs={'task_id': second.id}))
+        self.assertEqual(self.counts(), (2, 1, 1))
+
+        self.client.delete(reverse('delete-actual-task', kwargs={'task_id': second.id}))
+        self.client.post(
+            reverse('bulk_tasks', kwargs={'project_id': self.project.id}), {"action": "mark_done", "ids": [third.id]},
+            format='json'
+        )
+        self.assertEqual(self.counts(), (2, 2, 0))
+
+    def test_repeated_soft_deletes_and_restores_count_once(self):
+        self.client.post(reverse('add_task', kwargs={'project_id': self.project.id}), {"description": "a"})
+        task = Task.objects.get(report=self.project)
+        self.client.patch(reverse('update_task_status', kwargs={'task_id': task.id}))
+        for _ in range(2):
+            response = self.client.delete(reverse('delete-task', kwargs={'task_id': task.id}))
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.counts(), (0, 0, 1))
+        for _ in range(2):
+            self.client.delete(reverse('restore-task', kwargs={'task_id': task.id}))
+        self.assertEqual(self.counts(), (1, 1, 0))
+        self.client.delete(reverse('delete-task', kwargs={'task_id': task.id}))
+        self.client.delete(reverse('delete-actual-task', kwargs={'task_id': task.id}))
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_single_task_writes_do_not_recount(self):
+        # Deltas leave drift alone; reconcile_task_counts repairs it.
+        self.client.post(reverse('add_task', kwargs={'project_id': self.project.id}), {"description": "a"})
+        Project.objects.filter(id=self.project.id).update(task_count=5)
+        task = Task.objects.get(report=self.project)
+        self.client.patch(reverse('update_task_status', kwargs={'task_id': task.id}))
+        self.assertEqual(self.counts(), (5, 1, 0))
+
+    def test_reconcile_repairs_drifted_counters(self):
+        Task.objects.create(
+            report=self.project, description="Untracked", status="done", created_date=datetime.now(),
+            last_updated_on=datetime.now()
+        )
+        Project.objects.filter(id=self.project.id).update(deleted_count=5)
+
+        out = StringIO()
+        call_command('reconcile_task_counts', '--dry-run', stdout=out)
+        self.assertIn("1 project(s) drifted", out.getvalue())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.deleted_count, 5)
+
+        call_command('reconcile_task_counts', stdout=StringIO())
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.task_count, self.project.done_count, self.project.deleted_count), (1, 1, 0)
+        )
@@ -1,5 +1,6 @@
 from django.urls import path
 from api import views
+from api.metrics import metrics_view
 
 urlpatterns = [
     path('signup/', views.Signup.as_view(), name='signup'),
@@ -8,15 +9,27 @@ urlpatterns = [
     path('get_pac/', views.get_pac.as_view(), name='get_pac'),
     path('create_project/', views.CreateProject.as_view(), name='create_project'),
     path('projects/',views.ProjectListView.as_view(),name='project-list'),
+    path('projects/import/', views.ImportChecklistView.as_view(), name='import_checklist'),
+    path('projects/export.zip', views.ProjectArchiveView.as_view(), name='projects_archive'),
     path('projects/<int:project_id>/update_title/', views.UpdateProjectTitleView.as_view(), name='update_project_title'),
+    path('projects/<int:project_id>/clone/', views.CloneProjectView.as_view(), name='clone_project'),
     path('projects/<int:project_id>/', views.ProjectDetailView.as_view(), name='project_detail'),
+    path('projects/<int:project_id>/export.md', views.ProjectExportView.as_view(), name='project_export'),
+    path('projects/<int:project_id>/changes', views.ProjectChangesView.as_view(), name='project_changes'),
+    path('projects/<int:project_id>/events/', views.project_events, name='project_events'),
     path('projects/<int:project_id>/add_task/', views.AddTaskView.as_view(), name='add_task'),
+    path('projects/<int:project_id>/tasks/bulk/', views.BulkTaskView.as_view(), name='bulk_tasks'),
     path('projects/<int:project_id>/delete/', views.ProjectDeleteView.as_view(), name='project_delete'),
     path('projects/<int:project_id>/restore/', views.ProjectRestoreView.as_view(), name='project_restore'),
     path('projects/<int:project_id>/actual_delete/', views.ProjectActualDeleteView.as_view(), name='project_actual_delete'),
+    path('metrics/', metrics_view, name='metrics'),
+    path('purge_jobs/<int:job_id>/', views.PurgeJobView.as_view(), name='purge_job'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('batch/', views.BatchView.as_view(), name='batch'),
     path('tasks/<int:task_id>/delete/', views.DeleteTaskView.as_view(), name='delete-task'),
     path('tasks/<int:task_id>/restore/', views.RestoreTaskView.as_view(), name='restore-task'),
     path('tasks/<int:task_id>/update_status/', views.UpdateTaskStatusView.as_view(), name='update_task_status'),
     path('tasks/<int:task_id>/update_description/', views.UpdateTaskDescriptionView.as_view(), name='update_task_description'),
+    path('tasks/<int:task_id>/move/', views.MoveTaskView.as_view(), name='move_task'),
     path('tasks/<int:task_id>/actual_delete/', views.DeleteActualTaskView.as_view(), name='delete-actual-task'),
 ]
\ No newline at end of file
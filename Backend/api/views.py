@@ -1,8 +1,8 @@
+import json
 from datetime import datetime
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -10,11 +10,86 @@ from django.core.exceptions import ValidationError
 from django.core.exceptions import MultipleObjectsReturned
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
-from api.models import Project, Task, Profile
+from api.models import Project, PurgeJob, Task, TaskTombstone, Profile
+from api.authentication import CachedTokenAuthentication, aauthenticate
+from api.markdown import InvalidChecklist, export_filename, import_checklist, project_markdown
+from api.cache import (
+    get_project_detail, get_project_list, invalidate_project, invalidate_project_list, set_project_detail,
+    set_project_list,
+)
+from api.conditional import not_modified, project_list_validators, project_validators, set_validators
+from api.pagination import InvalidCursor, get_page_size, is_paginated, keyset_page
+from api.sync import SYNC_OVERLAP, InvalidSince, decode_since, encode_since, project_changes
+from api.events import event_stream, publish_on_commit, task_payload
+from api.archive import aprojects_archive, projects_archive
+from api.batch import BatchError, run_batch
+from api.clone import clone_project
+from api.purge import job_payload, request_project_purge
+from api.ranking import RANK_MAX_LENGTH, needs_rebalance, rank_between
+from api.rebalance import rebalance_project, schedule_rebalance
+from api.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import get_object_or_404
+from django.http import JsonResponse, StreamingHttpResponse
+from django.db import transaction
+from django.db.models import Case, OuterRef, Q, Value, When
+from django.utils import timezone
 
 # Create your views here.
 
+TASK_FIELDS = ("id", "description", "status", "created_date", "last_updated_on", "rank")
+
+
+TOGGLE_STATUS = Case(When(status="not_done", then=Value("done")), default=Value("not_done"))
+
+
+def task_count_deltas(changes, task):
+    """Counter changes made by writing ``changes`` to one task, given the row as it is afterwards.
+
+    Soft deletes and restores only count when the row actually changed state;
+    ``_update_owned_task`` makes sure of that.
+    """
+    done = task["status"] == "done"
+    if "isDeleted" in changes:
+        sign = -1 if task["isDeleted"] else 1
+        return {"task_count": sign, "deleted_count": -sign, "done_count": sign * done}
+    if "status" in changes and not task["isDeleted"]:
+        return {"done_count": 1 if done else -1}
+    return {}
+
+
+def _update_owned_task(user, task_id, event, **changes):
+    """Apply ``changes`` to one of ``user``'s tasks with a single conditional UPDATE.
+
+    The ownership check is part of the UPDATE itself, so concurrent writers
+    cannot interleave with it. Returns ``(owned, task)``: ``task`` is the
+    row as it is now, or ``None`` if it does not exist, and ``owned`` is
+    False when it belongs to another user. Subscribers get ``event`` on commit.
+    Deleting a deleted task or restoring a live one changes nothing.
+    """
+    tasks = Task.objects.filter(id=task_id, report__created_by=user)
+    if "isDeleted" in changes:
+        tasks = tasks.exclude(isDeleted=changes["isDeleted"])
+    with transaction.atomic():
+        updated = tasks.update(version=Project.next_version(OuterRef("report_id")), **changes)
+        task = Task.objects.filter(id=task_id).values("report_id", "isDeleted", *TASK_FIELDS).first()
+        if updated:
+            Project.bump_version(task["report_id"], task_count_deltas(changes, task))
+            publish_on_commit(task["report_id"], event, task=task_payload(task))
+    if updated:
+        invalidate_project_list(user.id)
+        invalidate_project(task["report_id"])
+        return True, task
+    return task is not None and Project.objects.filter(id=task["report_id"], created_by=user).exists(), task
+
+
+def _cached_response(request, entry):
+    data, etag, last_modified = entry
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = set_validators(Response(data, status=200), etag, last_modified)
+    return response
+
 
 class Signup(APIView):
     authentication_classes = []  
@@ -99,7 +174,7 @@ class SignInView(APIView):
             return Response({'message': 'An error occurred: ' + str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
 class TokenValidationView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]  
 
     def get(self, request):
@@ -111,7 +186,7 @@ class TokenValidationView(APIView):
 
 
 class CreateProject(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def post(self, request):
@@ -131,6 +206,7 @@ class CreateProject(APIView):
             title=title,
             created_date=datetime.now()
         )
+        invalidate_project_list(user.id)
         
         return Response({
             "id": project.id,
@@ -139,8 +215,65 @@ class CreateProject(APIView):
             "created_by": project.created_by.username
         }, status=status.HTTP_201_CREATED)
         
+class CloneProjectView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, project_id):
+        project = get_object_or_404(Project, id=project_id, created_by=request.user)
+
+        title = request.data.get("title") or f"{project.title} (copy)"[:255]
+        options = {key: request.data.get(key, False) for key in ("reset_status", "include_deleted")}
+        if not isinstance(title, str) or len(title) > 255:
+            return Response({"error": "title must be a string of at most 255 characters"}, status=400)
+        if not all(isinstance(value, bool) for value in options.values()):
+            return Response({"error": "reset_status and include_deleted must be true or false"}, status=400)
+
+        clone, copied = clone_project(project, request.user, title, **options)
+        return Response({
+            "id": clone.id,
+            "title": clone.title,
+            "created_date": clone.created_date,
+            "created_by": request.user.username,
+            "copied_tasks": copied,
+        }, status=status.HTTP_201_CREATED)
+        
+class ImportChecklistView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Import an uploaded Markdown checklist (``file``) into a new project or into ``project_id``."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "A Markdown file is required"}, status=400)
+
+        title = request.data.get("title")
+        if title is not None and (not isinstance(title, str) or len(title) > 255):
+            return Response({"error": "title must be a string of at most 255 characters"}, status=400)
+
+        project = None
+        if request.data.get("project_id"):
+            try:
+                project_id = int(request.data["project_id"])
+            except ValueError:
+                return Response({"error": "Invalid project_id"}, status=400)
+            project = get_object_or_404(Project, id=project_id, created_by=request.user)
+
+        try:
+            project, created, imported = import_checklist(upload, request.user, project, title)
+        except InvalidChecklist as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response({
+            "id": project.id,
+            "title": project.title,
+            "created": created,
+            "imported_tasks": imported,
+        }, status=status.HTTP_201_CREATED if created else 200)
+        
 class ProjectListView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def get(self, request):
@@ -149,22 +282,44 @@ class ProjectListView(APIView):
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
         
         
+        cached, cache_key = get_project_list(request)
+        if cached is not None:
+            return _cached_response(request, cached)
+
         projects = Project.objects.filter(created_by=user)
 
+        etag, last_modified = project_list_validators(request, projects)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        next_cursor = None
+        if is_paginated(request):
+            try:
+                projects, next_cursor = keyset_page(projects, request.query_params.get("cursor"), get_page_size(request))
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         project_list = [
             {
                 "id": project.id,
                 "title": project.title,
                 "created_date": project.created_date,
-                "isDeleted": project.isDeleted
+                "isDeleted": project.isDeleted,
+                "task_count": project.task_count,
+                "done_count": project.done_count,
+                "deleted_count": project.deleted_count,
             }
             for project in projects
         ]
         
-        return Response(project_list, status=status.HTTP_200_OK)
+        if is_paginated(request):
+            project_list = {"results": project_list, "next_cursor": next_cursor}
+        set_project_list(cache_key, (project_list, etag, last_modified))
+        return set_validators(Response(project_list, status=status.HTTP_200_OK), etag, last_modified)
     
 class ProjectDeleteView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def delete(self, request, project_id):
@@ -176,7 +331,11 @@ class ProjectDeleteView(APIView):
         project = get_object_or_404(Project, id=project_id, created_by=user)
         
         project.isDeleted=True
-        project.save()
+        project.mark_updated()
+        project.save(update_fields=["isDeleted", "version", "last_updated_on"])
+        publish_on_commit(project.id, "project.deleted")
+        invalidate_project_list(user.id)
+        invalidate_project(project.id)
         
         
         # project.delete()
@@ -184,7 +343,7 @@ class ProjectDeleteView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 class ProjectRestoreView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def delete(self, request, project_id):
@@ -196,7 +355,11 @@ class ProjectRestoreView(APIView):
         project = get_object_or_404(Project, id=project_id, created_by=user)
         
         project.isDeleted=False
-        project.save()
+        project.mark_updated()
+        project.save(update_fields=["isDeleted", "version", "last_updated_on"])
+        publish_on_commit(project.id, "project.restored")
+        invalidate_project_list(user.id)
+        invalidate_project(project.id)
         
         
         # project.delete()
@@ -204,7 +367,7 @@ class ProjectRestoreView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 class ProjectActualDeleteView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def delete(self, request, project_id):
@@ -216,14 +379,26 @@ class ProjectActualDeleteView(APIView):
         project = get_object_or_404(Project, id=project_id, created_by=user)
         
         
-        project.delete()
+        # The rows are deleted in chunks by the purge worker (api/purge.py).
+        job = request_project_purge(project, user)
+        invalidate_project_list(user.id)
+        invalidate_project(project_id)
+        publish_on_commit(project_id, "project.removed")
         
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(job_payload(job), status=status.HTTP_202_ACCEPTED)
+    
+class PurgeJobView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(PurgeJob, id=job_id, requested_by=request.user)
+        return Response(job_payload(job), status=200)
     
 # ================Detail page view================
     
 class ProjectDetailView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]    
     
     def get(self, request, project_id):
@@ -231,30 +406,39 @@ class ProjectDetailView(APIView):
         if not user.is_authenticated:
             return Response({"error": "Authentication required"}, status=401)
         
+        cached, cache_key = get_project_detail(request, project_id)
+        if cached is not None:
+            return _cached_response(request, cached)
+
         project = get_object_or_404(Project, id=project_id, created_by=user)
 
-        tasks = Task.objects.filter(report = project, isDeleted=False)
-
-        task_data = []
-        for task in tasks:
-            task_data.append({
-                "id": task.id,
-                "description": task.description,
-                "status": task.status,
-                "created_date": task.created_date,
-                "last_updated_on": task.last_updated_on
-            })
-            
-        deleted_tasks = Task.objects.filter(report = project, isDeleted=True)
-        deleted_task_data = []
-        for task in deleted_tasks:
-            deleted_task_data.append({
-                "id": task.id,
-                "description": task.description,
-                "status": task.status,
-                "created_date": task.created_date,
-                "last_updated_on": task.last_updated_on
-            })
+        etag, last_modified = project_validators(request, project)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        if is_paginated(request):
+            tasks = Task.objects.filter(report = project).values(*TASK_FIELDS)
+            try:
+                page_size = get_page_size(request)
+                task_data, next_cursor = keyset_page(
+                    tasks.filter(isDeleted=False), request.query_params.get("cursor"), page_size, key="rank"
+                )
+                deleted_task_data, deleted_next_cursor = keyset_page(
+                    tasks.filter(isDeleted=True), request.query_params.get("deleted_cursor"), page_size, key="rank"
+                )
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=400)
+        else:
+            # One query for live and deleted tasks, split in a single pass.
+            task_data = []
+            deleted_task_data = []
+            tasks = Task.objects.filter(report=project).order_by("rank", "id").values_list(*TASK_FIELDS, "isDeleted")
+            for *task, is_deleted in tasks.iterator(chunk_size=2000):
+                if is_deleted:
+                    deleted_task_data.append(dict(zip(TASK_FIELDS, task)))
+                else:
+                    task_data.append(dict(zip(TASK_FIELDS, task)))
 
         response_data = {
             "id": project.id,
@@ -263,11 +447,89 @@ class ProjectDetailView(APIView):
             "tasks": task_data,
             "deleted_task": deleted_task_data
         }
+        if is_paginated(request):
+            response_data["next_cursor"] = next_cursor
+            response_data["deleted_next_cursor"] = deleted_next_cursor
 
-        return Response(response_data, status=200)
+        set_project_detail(cache_key, (response_data, etag, last_modified))
+        return set_validators(Response(response_data, status=200), etag, last_modified)
+    
+class ProjectExportView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [AllowAny]
+
+    def get(self, request, project_id):
+        user = request.user
+        if not user.is_authenticated:
+            return Response({"error": "Authentication required"}, status=401)
+
+        project = get_object_or_404(Project, id=project_id, created_by=user)
+
+        response = StreamingHttpResponse(project_markdown(project), content_type="text/markdown; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{export_filename(project)}"'
+        return response
+    
+class ProjectArchiveView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Stream a ZIP of the user's projects as Markdown, optionally only those changed after ``since``.
+
+        ``X-Export-Cursor`` is the ``since`` to pass on the next incremental export.
+        """
+        projects = Project.objects.filter(created_by=request.user)
+        since = request.query_params.get("since")
+        if since:
+            try:
+                moment = decode_since(since)
+            except InvalidSince as e:
+                return Response({"error": str(e)}, status=400)
+            projects = projects.filter(
+                Q(last_updated_on__gt=moment) | Q(last_updated_on__isnull=True, created_date__gt=moment)
+            )
+
+        cursor = encode_since(timezone.now() - SYNC_OVERLAP)
+        archive = aprojects_archive if isinstance(request._request, ASGIRequest) else projects_archive
+        response = StreamingHttpResponse(archive(projects), content_type="application/zip")
+        response["Content-Disposition"] = 'attachment; filename="projects.zip"'
+        response["X-Export-Cursor"] = cursor
+        return response
+    
+class ProjectChangesView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, project_id):
+        project = get_object_or_404(Project, id=project_id, created_by=request.user)
+
+        try:
+            changes = project_changes(project, request.query_params.get("since"))
+        except InvalidSince as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(changes, status=200)
+    
+async def project_events(request, project_id):
+    """Server-Sent Events stream of task and project changes; serve under ASGI."""
+    # EventSource cannot set headers, so the token may also come as ?token=.
+    user = await aauthenticate(request, allow_query=True)
+    if user is None:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    if not await Project.objects.filter(id=project_id, created_by=user).aexists():
+        return JsonResponse({"detail": "Not found."}, status=404)
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the stream would hold a worker thread for as long as
+        # the client stays connected.
+        return JsonResponse({"error": "Live updates need the ASGI server"}, status=501)
+
+    response = StreamingHttpResponse(event_stream(project_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
     
 class AddTaskView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
     def post(self, request, project_id):
         
@@ -287,9 +549,20 @@ class AddTaskView(APIView):
             report=project,
             description=task_description,
             status="not_done",  
-            created_date=datetime.now(),  
-            last_updated_on=datetime.now(),  
+            created_date=timezone.now(),  
+            last_updated_on=timezone.now(),  
+            version=Project.next_version(project.id),
         )
+        Project.bump_version(project.id, {"task_count": 1})
+        invalidate_project_list(user.id)
+        invalidate_project(project.id)
+        publish_on_commit(project.id, "task.created", task={
+            "id": task.id,
+            "description": task.description,
+            "status": task.status,
+            "last_updated_on": task.last_updated_on,
+            "rank": task.rank,
+        })
 
         return Response({
             "id": task.id,
@@ -297,10 +570,112 @@ class AddTaskView(APIView):
             "status": task.status,
             "created_date": task.created_date,
             "last_updated_on": task.last_updated_on,
+            "rank": task.rank,
         }, status=201)
         
+BULK_MAX_ITEMS = 10000
+# Filterable fields and the values each accepts.
+BULK_FILTERS = {"status": ("done", "not_done"), "isDeleted": (True, False)}
+BULK_UPDATES = {
+    "mark_done": {"status": "done"},
+    "mark_not_done": {"status": "not_done"},
+    "delete": {"isDeleted": True},
+    "restore": {"isDeleted": False},
+}
+
+
+class BulkTaskView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, project_id):
+        project = get_object_or_404(Project, id=project_id, created_by=request.user)
+        action = request.data.get("action")
+
+        if action == "create":
+            return self.create(project, request.data.get("descriptions"))
+        if action not in BULK_UPDATES and action != "hard_delete":
+            return Response({"error": f"Unknown action: {action}"}, status=400)
+
+        ids = request.data.get("ids")
+        task_filter = request.data.get("filter")
+        if ids is None and task_filter is None:
+            return Response({"error": "Provide ids or filter"}, status=400)
+
+        tasks = Task.objects.filter(report=project)
+        if ids is not None:
+            if not isinstance(ids, list) or len(ids) > BULK_MAX_ITEMS or not all(type(i) is int for i in ids):
+                return Response({"error": f"ids must be a list of at most {BULK_MAX_ITEMS} integers"}, status=400)
+            tasks = tasks.filter(id__in=ids)
+        if task_filter is not None:
+            if not isinstance(task_filter, dict) or set(task_filter) - set(BULK_FILTERS):
+                return Response({"error": f"filter accepts only {', '.join(BULK_FILTERS)}"}, status=400)
+            for field, value in task_filter.items():
+                # type() keeps 0 and 1 from passing for False and True.
+                if not any(type(value) is type(allowed) and value == allowed for allowed in BULK_FILTERS[field]):
+                    choices = " or ".join(json.dumps(choice) for choice in BULK_FILTERS[field])
+                    return Response({"error": f"filter {field} must be {choices}"}, status=400)
+            tasks = tasks.filter(**task_filter)
+
+        with transaction.atomic():
+            if action == "hard_delete":
+                TaskTombstone.record(project.id, tasks.values_list("id", flat=True))
+                count, _ = tasks.delete()
+            else:
+                count = tasks.update(
+                    last_updated_on=timezone.now(), version=Project.next_version(project.id), **BULK_UPDATES[action]
+                )
+            if count:
+                Project.bump_version(project.id)
+                publish_on_commit(project.id, "tasks.bulk", action=action, count=count)
+        if count:
+            invalidate_project_list(request.user.id)
+            invalidate_project(project.id)
+
+        return Response({"action": action, "count": count}, status=200)
+
+    def create(self, project, descriptions):
+        if (
+            not isinstance(descriptions, list) or not descriptions or len(descriptions) > BULK_MAX_ITEMS
+            or not all(isinstance(d, str) and 0 < len(d) <= 255 for d in descriptions)
+        ):
+            return Response(
+                {"error": f"descriptions must be a list of 1 to {BULK_MAX_ITEMS} non-empty strings"}, status=400
+            )
+
+        now = timezone.now()
+        with transaction.atomic():
+            version = Project.read_next_version(project.id)
+            tasks = Task.objects.bulk_create([
+                Task(
+                    report=project, description=description, status="not_done", created_date=now, last_updated_on=now,
+                    version=version,
+                )
+                for description in descriptions
+            ])
+            Project.bump_version(project.id)
+            publish_on_commit(project.id, "tasks.bulk", action="create", count=len(tasks))
+        invalidate_project_list(project.created_by_id)
+        invalidate_project(project.id)
+
+        return Response({
+            "action": "create",
+            "count": len(tasks),
+            "tasks": [
+                {
+                    "id": task.id,
+                    "description": task.description,
+                    "status": task.status,
+                    "created_date": task.created_date,
+                    "last_updated_on": task.last_updated_on,
+                    "rank": task.rank,
+                }
+                for task in tasks
+            ],
+        }, status=201)
+
 class UpdateTaskStatusView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
     
     def patch(self, request, task_id):
@@ -308,59 +683,97 @@ class UpdateTaskStatusView(APIView):
         if not user.is_authenticated:
             return Response({"error": "Authentication required"}, status=401)
 
-        task = get_object_or_404(Task, id=task_id)
-
-        if task.report.created_by != user:
+        updated, task = _update_owned_task(user, task_id, "task.updated", status=TOGGLE_STATUS, last_updated_on=timezone.now())
+        if task is None:
+            return Response({"detail": "Not found."}, status=404)
+        if not updated:
             return Response({"error": "Permission denied"}, status=403)
 
-        task.last_updated_on = datetime.now() 
-        task.status = 'done' if task.status == 'not_done' else 'not_done'
-        task.save()
-
         return Response({
-            "id": task.id,
-            "description": task.description,
-            "status": task.status,
-            "last_updated_on": task.last_updated_on,  
+            "id": task["id"],
+            "description": task["description"],
+            "status": task["status"],
+            "last_updated_on": task["last_updated_on"],  
         })
         
 class UpdateTaskDescriptionView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, task_id):
         
-        try:
-            task = Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
-            return Response({"detail": "Task not found."}, status=404)
-
-        
-        if task.report.created_by != request.user:
-            return Response({"detail": "You do not have permission to edit this task."}, status=403)
-
-        
+        changes = {"last_updated_on": timezone.now()}
         new_description = request.data.get("description", None)
 
         if new_description:
-            task.description = new_description
+            changes["description"] = new_description
 
-        
-        task.last_updated_on = datetime.now()
-        task.save()
+        updated, task = _update_owned_task(request.user, task_id, "task.updated", **changes)
+        if task is None:
+            return Response({"detail": "Task not found."}, status=404)
+        if not updated:
+            return Response({"detail": "You do not have permission to edit this task."}, status=403)
 
-        
         response_data = {
-            "id": task.id,
-            "description": task.description,
-            "status": task.status,
-            "last_updated_on": task.last_updated_on.isoformat(),
+            "id": task["id"],
+            "description": task["description"],
+            "status": task["status"],
+            "last_updated_on": task["last_updated_on"].isoformat(),
         }
 
         return Response(response_data, status=200)
     
+class MoveTaskView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, task_id):
+        """Move the task between ``after`` and ``before``, the ids of its new neighbours.
+
+        Leave out ``after`` to move it to the top and ``before`` to move it
+        to the bottom. Only the moved task's rank is rewritten.
+        """
+        after_id, before_id = request.data.get("after"), request.data.get("before")
+        neighbour_ids = [i for i in (after_id, before_id) if i is not None]
+        if not all(type(i) is int and i != task_id for i in neighbour_ids):
+            return Response({"error": "after and before must be ids of other tasks"}, status=400)
+
+        tasks = {
+            task[0]: task[1:] for task in Task.objects.filter(
+                id__in=[task_id, *neighbour_ids], report__created_by=request.user
+            ).values_list("id", "report_id", "rank")
+        }
+        if task_id not in tasks:
+            return Response({"detail": "Task not found."}, status=404)
+        project_id = tasks[task_id][0]
+        if any(tasks.get(i, (None,))[0] != project_id for i in neighbour_ids):
+            return Response({"error": "after and before must be tasks in the same project"}, status=400)
+
+        after_rank = tasks[after_id][1] if after_id is not None else None
+        before_rank = tasks[before_id][1] if before_id is not None else None
+        try:
+            rank = rank_between(after_rank, before_rank)
+        except ValueError:
+            if after_rank != before_rank:
+                return Response({"error": "after must come before before in the current order"}, status=409)
+            rank = None
+        if rank is None or len(rank) > RANK_MAX_LENGTH:
+            # Neighbours created in the same microsecond by two processes, or
+            # a gap the background rebalance has not got to yet.
+            rebalance_project(project_id)
+            return Response({"error": "Task order was rebalanced; reload it and retry"}, status=409)
+
+        updated, task = _update_owned_task(
+            request.user, task_id, "task.updated", rank=rank, last_updated_on=timezone.now()
+        )
+        if task is None:
+            return Response({"detail": "Task not found."}, status=404)
+        if needs_rebalance(rank):
+            schedule_rebalance(project_id)
+        return Response(task_payload(task), status=200)
+    
 class get_pac(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     def get(self,request):
         user = request.user
@@ -376,7 +789,7 @@ class get_pac(APIView):
     
 
 class UpdateProjectTitleView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, project_id):
@@ -386,7 +799,7 @@ class UpdateProjectTitleView(APIView):
         except Project.DoesNotExist:
             return Response({"detail": "Project not found."}, status=404)
 
-        if project.created_by != request.user:
+        if project.created_by_id != request.user.id:
             return Response({"detail": "You do not have permission to edit this project."}, status=403)
 
         new_title = request.data.get("title", None)
@@ -395,8 +808,11 @@ class UpdateProjectTitleView(APIView):
             return Response({"detail": "Title cannot be empty."}, status=400)
 
         project.title = new_title
-        project.last_updated_on = datetime.now()
-        project.save()
+        project.mark_updated()
+        project.save(update_fields=["title", "version", "last_updated_on"])
+        publish_on_commit(project.id, "project.updated", title=project.title)
+        invalidate_project_list(request.user.id)
+        invalidate_project(project.id)
 
         response_data = {
             "id": project.id,
@@ -407,65 +823,98 @@ class UpdateProjectTitleView(APIView):
         return Response(response_data, status=200)
     
 class DeleteTaskView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, task_id):
-        try:
-            task = Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
+        updated, task = _update_owned_task(request.user, task_id, "task.deleted", isDeleted=True, last_updated_on=timezone.now())
+        if task is None:
             return Response({"detail": "Task not found."}, status=404)
-
-        if task.report.created_by != request.user:
+        if not updated:
             return Response({"detail": "You do not have permission to delete this task."}, status=403)
 
-        task.isDeleted=True
-        task.save()
-
         # task.delete()
         return Response({"detail": "Task deleted successfully."}, status=204)
     
 class RestoreTaskView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, task_id):
-        try:
-            task = Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
+        updated, task = _update_owned_task(request.user, task_id, "task.restored", isDeleted=False, last_updated_on=timezone.now())
+        if task is None:
             return Response({"detail": "Task not found."}, status=404)
-
-        if task.report.created_by != request.user:
+        if not updated:
             return Response({"detail": "You do not have permission to delete this task."}, status=403)
 
-        task.isDeleted=False
-        task.save()
-
         # task.delete()
         return Response({"detail": "Task deleted successfully."}, status=204)
     
 class DeleteActualTaskView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, task_id):
         try:
-            task = Task.objects.get(id=task_id)
+            task = Task.objects.select_related("report").get(id=task_id)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found."}, status=404)
 
-        if task.report.created_by != request.user:
+        if task.report.created_by_id != request.user.id:
             return Response({"detail": "You do not have permission to delete this task."}, status=403)
 
 
-        task.delete()
+        with transaction.atomic():
+            publish_on_commit(task.report_id, "task.removed", task={"id": task.id})
+            TaskTombstone.record(task.report_id, [task.id], Project.next_version(task.report_id))
+            task.delete()
+            if task.isDeleted:
+                deltas = {"deleted_count": -1}
+            else:
+                deltas = {"task_count": -1, "done_count": -(task.status == "done")}
+            Project.bump_version(task.report_id, deltas)
+        invalidate_project_list(request.user.id)
+        invalidate_project(task.report_id)
         return Response({"detail": "Task deleted successfully."}, status=204)
     
     
+class SearchView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "Search query is required"}, status=400)
+        try:
+            limit = min(int(request.query_params.get("limit", DEFAULT_SEARCH_LIMIT)), MAX_SEARCH_LIMIT)
+        except ValueError:
+            return Response({"error": "Invalid limit"}, status=400)
+
+        return Response(search(request.user, query, max(limit, 1)), status=200)
+
+
+class BatchView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get("requests") if isinstance(request.data, dict) else None
+        try:
+            results, committed = run_batch(request, items)
+        except BatchError as exc:
+            return Response({"error": str(exc), "index": exc.index}, status=400)
+        # A failed sub-request rolls the batch back; its status becomes the batch's.
+        return Response(
+            {"committed": committed, "responses": results},
+            status=200 if committed else results[-1]["status"],
+        )
+    
+    
 # ===========Profile==================    
     
 class UserProfileView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
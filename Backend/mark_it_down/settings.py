@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,14 +89,126 @@ WSGI_APPLICATION = 'mark_it_down.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connection profiles for SQLite, picked with the SQLITE_PROFILE environment
+# variable. "production" is tuned for concurrent writers:
+#   - WAL lets readers carry on while a write is in progress;
+#   - busy_timeout makes a writer wait up to 20s for the lock instead of failing;
+#   - IMMEDIATE transactions take the write lock at BEGIN. Two deferred
+#     transactions that both read first deadlock on the upgrade, and SQLite
+#     fails one of them with "database is locked" without waiting at all;
+#   - synchronous=NORMAL is safe in WAL mode (a power cut can lose the last
+#     commits, never corrupt the file) and saves an fsync per commit;
+#   - cache_size is per connection, in KiB when negative;
+#   - CONN_MAX_AGE keeps each worker thread's connection open between requests.
+# "stock" is Django's defaults, for comparison (see `manage.py benchmark_sqlite`).
+SQLITE_PROFILES = {
+    'stock': {
+        'OPTIONS': {},
+        'CONN_MAX_AGE': 0,
+    },
+    'production': {
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL; PRAGMA busy_timeout=20000; PRAGMA synchronous=NORMAL; '
+                'PRAGMA cache_size=-20000; PRAGMA temp_store=MEMORY'
+            ),
+        },
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+}
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        **SQLITE_PROFILES[SQLITE_PROFILE],
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Project list/detail responses; TIMEOUT is the TTL in seconds and
+    # MAX_ENTRIES bounds the size. Swap in FileBasedCache to share it
+    # between worker processes.
+    'api': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Token revocation generations (api.authentication). Every worker process
+    # on this host reads it; switch to Redis or Memcached when the workers
+    # run on several hosts.
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'mark_it_down', 'auth'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+}
+
+# Cache alias used for API responses; set to None to disable.
+API_RESPONSE_CACHE = 'api'
+
+# In-process cache of resolved auth tokens (api.authentication).
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAX_SIZE = 10000
+# Cache alias through which token revocations reach every worker process; it
+# must be shared between them to do so. None leaves other processes to
+# notice within TOKEN_CACHE_TTL.
+TOKEN_REVOCATION_CACHE = 'auth'
+
+# Background hard deletes (api.purge). Rows are deleted PURGE_CHUNK_SIZE at a
+# time, one short transaction each. With PURGE_WORKER_IN_PROCESS a thread in
+# the web process drains the queue; otherwise run `manage.py run_purge_worker`.
+# `manage.py purge_trash` (run it from cron) deletes trash older than
+# TRASH_RETENTION_DAYS the same way. A running job whose worker has not
+# reported progress for PURGE_LEASE_SECONDS is taken over by the next worker.
+PURGE_CHUNK_SIZE = 500
+PURGE_LEASE_SECONDS = 300
+PURGE_WORKER_IN_PROCESS = True
+TRASH_RETENTION_DAYS = 30
+
+# Manual task order (api.ranking). When a move makes a rank too long, a thread
+# in the web process rewrites that project's ranks; without
+# RANK_REBALANCE_IN_PROCESS run `manage.py rebalance_task_ranks` from cron.
+RANK_REBALANCE_IN_PROCESS = True
+
+# JSON goes through orjson when it is installed (api.renderers), with DRF's
+# stdlib encoder as the fallback. The browsable API is for development only.
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': ['api.renderers.FastJSONRenderer'] + (
+        ['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []
+    ),
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Request metrics (api.metrics): every /api/ response carries a Server-Timing
+# header and /api/metrics/ serves per-route histograms for Prometheus. Set
+# SLOW_REQUEST_MS to log requests slower than that, with their SQL, to the
+# api.slow_requests logger; capturing the SQL costs a little on every request.
+# /api/metrics/ answers staff sessions and `Authorization: Bearer
+# <METRICS_TOKEN>`; leave METRICS_TOKEN unset to allow staff only.
+SLOW_REQUEST_MS = None
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
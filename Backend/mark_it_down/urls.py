@@ -20,5 +20,6 @@ from django.urls import include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/async/', include('api.async_urls')),
     path('api/', include('api.urls')),
 ]
@@ -129,7 +129,7 @@ const Dashboard = () => {
             },
           }
         );
-        if (response.status === 204) {
+        if (response.status === 202) {
           toast.success("Project deleted successfully!");
           setProjects((prevProjects) =>
             prevProjects.filter((project) => project.id !== projectId)
@@ -335,6 +335,9 @@ const Dashboard = () => {
                     Created on:{" "}
                     {new Date(project.created_date).toLocaleString()}
                   </p>
+                  <p className="bg-white mb-0">
+                    {project.done_count}/{project.task_count} Completed
+                  </p>
                 </div>
               ))
           ) : (
@@ -339,16 +339,28 @@ ${taskListMarkdownDone}
   };
 
   // Function to download Markdown file
-  const downloadMarkdown = () => {
-    const markdownContent = generateMarkdown();
-    const blob = new Blob([markdownContent], { type: "text/markdown" });
+  const downloadMarkdown = async () => {
+    const token = localStorage.getItem("token");
+    let blob;
+    try {
+      const response = await axios.get(`${link}/api/projects/${id}/export.md`, {
+        headers: {
+          Authorization: `Token ${token}`,
+        },
+        responseType: "blob",
+      });
+      blob = response.data;
+    } catch (error) {
+      toast.error("Failed to export project");
+      return;
+    }
     const url = URL.createObjectURL(blob);
-    const link = document.createElement("a");
-    link.href = url;
-    link.download = `${projectDetails?.title}-tasks.md`;
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
+    const anchor = document.createElement("a");
+    anchor.href = url;
+    anchor.download = `${projectDetails?.title}-tasks.md`;
+    document.body.appendChild(anchor);
+    anchor.click();
+    document.body.removeChild(anchor);
     URL.revokeObjectURL(url);
   };
 